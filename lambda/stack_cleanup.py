@@ -0,0 +1,454 @@
+"""Custom resource handler that clears deletion blockers so the OpenEMR stack can be destroyed cleanly."""
+
+import functools
+import json
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import urllib3
+
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+# urllib3 ships with botocore, so no extra dependency; the pool is reused across warm invocations and retries
+http = urllib3.PoolManager()
+
+# Bounded fan-out for independent per-item deletes
+DELETE_WORKERS = 16
+
+# Clients are cached at module scope so warm invocations (e.g. a retried Delete) skip model loading and setup
+_CLIENTS = {}
+
+
+@functools.cache
+def client_config():
+    """Return the botocore Config shared by every client.
+
+    Enough pooled connections for the concurrent deletes, adaptive retries to absorb throttling,
+    keep-alive and short connect timeouts so a stuck call cannot eat the Lambda's time budget.
+    """
+    from botocore.config import Config
+
+    return Config(
+        max_pool_connections=50,
+        retries={"mode": "adaptive", "max_attempts": 10},
+        tcp_keepalive=True,
+        connect_timeout=5,
+        read_timeout=30,
+    )
+
+
+def client(service_name):
+    """Return the cached boto3 client for service_name, creating it on first use.
+
+    boto3 is imported here rather than at module level so Create and Update, which only
+    acknowledge the request, never pay for loading it.
+    """
+    if service_name not in _CLIENTS:
+        import boto3
+
+        _CLIENTS[service_name] = boto3.client(service_name, config=client_config())
+    return _CLIENTS[service_name]
+
+
+def wait_until(condition, description, timeout=120, max_delay=30):
+    """Poll condition() with exponential backoff (1s, 2s, 4s, ...) until it is true or timeout seconds pass."""
+    deadline = time.monotonic() + timeout
+    delay = 1
+    while not condition():
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            logger.warning(f"Timed out after {timeout}s waiting for {description}")
+            return False
+        logger.info(f"Waiting {min(delay, remaining):.0f}s for {description}...")
+        time.sleep(min(delay, remaining))
+        delay = min(delay * 2, max_delay)
+    return True
+
+
+def send_response(event, context, response_status, response_data=None, physical_resource_id=None, reason=None):
+    """Send response to CloudFormation."""
+    response_url = event["ResponseURL"]
+
+    response_body = {
+        "Status": response_status,
+        "Reason": reason or f"See CloudWatch Log Stream: {context.log_stream_name}",
+        "PhysicalResourceId": physical_resource_id or context.log_stream_name,
+        "StackId": event["StackId"],
+        "RequestId": event["RequestId"],
+        "LogicalResourceId": event["LogicalResourceId"],
+        "Data": response_data or {},
+    }
+
+    json_response_body = json.dumps(response_body).encode("utf-8")
+
+    try:
+        response = http.request(
+            "PUT",
+            response_url,
+            body=json_response_body,
+            headers={"Content-Type": "", "Content-Length": str(len(json_response_body))},
+        )
+    except urllib3.exceptions.HTTPError as e:
+        logger.error(f"Failed to send response: {str(e)}")
+        return
+    except Exception as e:
+        # Never let a reporting failure escape the handler unlogged
+        logger.error(f"Unexpected error sending response: {str(e)}", exc_info=True)
+        return
+
+    # urllib3 does not raise on error statuses, e.g. a 403 from an expired presigned URL
+    if response.status >= 400:
+        logger.error(f"CloudFormation rejected the response: HTTP {response.status} {response.data[:500]!r}")
+    else:
+        logger.info(f"Response sent successfully: {response.status}")
+
+
+def _cleanup_rds(rds_client, db_cluster_identifier):
+    """Disable RDS deletion protection."""
+    try:
+        logger.info(f"Disabling deletion protection for DB cluster: {db_cluster_identifier}")
+        rds_client.modify_db_cluster(DBClusterIdentifier=db_cluster_identifier, DeletionProtection=False)
+        logger.info("RDS deletion protection disabled successfully")
+    except Exception as e:
+        # If cluster doesn't exist or is already being deleted, that's okay
+        logger.warning(f"Could not disable RDS deletion protection: {str(e)}")
+
+
+def _cleanup_alb(elbv2_client, alb_arn):
+    """Disable ALB deletion protection."""
+    try:
+        logger.info(f"Disabling deletion protection for ALB: {alb_arn}")
+        elbv2_client.modify_load_balancer_attributes(
+            LoadBalancerArn=alb_arn, Attributes=[{"Key": "deletion_protection.enabled", "Value": "false"}]
+        )
+        logger.info("ALB deletion protection disabled successfully")
+    except Exception as e:
+        # If ALB doesn't exist or is already being deleted, that's okay
+        logger.warning(f"Could not disable ALB deletion protection: {str(e)}")
+
+
+def _cleanup_ses(ses_client, ses_rule_set_name):
+    """Delete the SES rule set completely (don't let CloudFormation do it)."""
+
+    def rule_set_inactive():
+        try:
+            check = ses_client.describe_active_receipt_rule_set()
+        except ses_client.exceptions.RuleSetDoesNotExistException:
+            return True
+        return check.get("Metadata", {}).get("Name") != ses_rule_set_name
+
+    def deactivate():
+        ses_client.set_active_receipt_rule_set(RuleSetName="")
+        logger.info("SES rule set deactivated, waiting for propagation...")
+        # Stop as soon as the deactivation is visible (up to 60 seconds)
+        if wait_until(rule_set_inactive, f"SES rule set {ses_rule_set_name} to deactivate", timeout=60):
+            logger.info("SES rule set successfully deactivated and verified")
+
+    try:
+        logger.info(f"Processing SES rule set: {ses_rule_set_name}")
+
+        # First check if it's the active rule set and deactivate if needed
+        try:
+            active_rule_set = ses_client.describe_active_receipt_rule_set()
+            active_name = active_rule_set.get("Metadata", {}).get("Name")
+
+            if active_name == ses_rule_set_name:
+                logger.info(f"SES rule set {ses_rule_set_name} is active, deactivating...")
+                deactivate()
+            else:
+                logger.info(f"SES rule set {ses_rule_set_name} is not active (active: {active_name})")
+
+        except ses_client.exceptions.RuleSetDoesNotExistException:
+            logger.info("No active SES rule set found")
+
+        # Deleting the rule set removes its rules as well, so no per-rule deletes are needed
+        try:
+            logger.info(f"Deleting SES rule set: {ses_rule_set_name}")
+            try:
+                ses_client.delete_receipt_rule_set(RuleSetName=ses_rule_set_name)
+            except ses_client.exceptions.CannotDeleteException as e:
+                # The set is still active - deactivation may not have propagated, so deactivate again and retry once
+                logger.info(f"SES rule set {ses_rule_set_name} could not be deleted ({str(e)}), deactivating again...")
+                deactivate()
+                ses_client.delete_receipt_rule_set(RuleSetName=ses_rule_set_name)
+            logger.info(f"SES rule set {ses_rule_set_name} deleted successfully")
+
+        except ses_client.exceptions.RuleSetDoesNotExistException:
+            logger.info(f"SES rule set {ses_rule_set_name} does not exist - already deleted")
+        except ses_client.exceptions.CannotDeleteException as e:
+            logger.error(f"Cannot delete SES rule set {ses_rule_set_name}: {str(e)}")
+            logger.error("Rule set is still active after retrying deactivation")
+            raise
+
+    except Exception as e:
+        logger.warning(f"Could not process SES rule set {ses_rule_set_name}: {str(e)}")
+        # Don't raise - allow other cleanup to continue
+
+
+def _cleanup_backup(backup_client, backup_vault_name):
+    """Delete all recovery points from the backup vault."""
+    try:
+        logger.info(f"Deleting recovery points from backup vault: {backup_vault_name}")
+
+        # List all recovery points in the vault
+        paginator = backup_client.get_paginator("list_recovery_points_by_backup_vault")
+        recovery_point_arns = [
+            recovery_point["RecoveryPointArn"]
+            for page in paginator.paginate(BackupVaultName=backup_vault_name)
+            for recovery_point in page.get("RecoveryPoints", [])
+        ]
+
+        def delete_recovery_point(recovery_point_arn):
+            try:
+                logger.info(f"Deleting recovery point: {recovery_point_arn}")
+                backup_client.delete_recovery_point(
+                    BackupVaultName=backup_vault_name, RecoveryPointArn=recovery_point_arn
+                )
+                return True
+            except Exception as e:
+                # Some recovery points may be protected or already deleted
+                logger.warning(f"Could not delete recovery point {recovery_point_arn}: {str(e)}")
+                return False
+
+        # Deletes are independent, so issue them concurrently
+        with ThreadPoolExecutor(max_workers=DELETE_WORKERS) as executor:
+            deleted_count = sum(executor.map(delete_recovery_point, recovery_point_arns))
+
+        failed_count = len(recovery_point_arns) - deleted_count
+        if failed_count > 0:
+            # The vault cannot become empty (e.g. Vault Lock or legal hold), so waiting would only burn the timeout
+            logger.warning(f"{failed_count} recovery points could not be deleted - not waiting for the vault to empty")
+        elif deleted_count > 0:
+            # Wait for the deletions to finish so CloudFormation can delete the (then empty) vault
+            logger.info(f"Deleted {deleted_count} recovery points, waiting for propagation...")
+
+            def vault_empty():
+                response = backup_client.list_recovery_points_by_backup_vault(
+                    BackupVaultName=backup_vault_name, MaxResults=1
+                )
+                return not response.get("RecoveryPoints")
+
+            wait_until(vault_empty, f"backup vault {backup_vault_name} to empty", timeout=60)
+
+        logger.info("Backup recovery point cleanup completed")
+    except Exception as e:
+        logger.warning(f"Could not delete backup recovery points: {str(e)}")
+
+
+def _cleanup_sagemaker(sagemaker_client, efs_client, ec2_client, tagging_client, sagemaker_domain_id):
+    """Clean up SageMaker domain EFS file systems and ENIs."""
+    try:
+        logger.info(f"Cleaning up EFS file systems for SageMaker domain: {sagemaker_domain_id}")
+
+        # Get domain details to find VPC (may fail if domain is already deleted)
+        vpc_id = None
+        try:
+            domain_response = sagemaker_client.describe_domain(DomainId=sagemaker_domain_id)
+            vpc_id = domain_response.get("VpcId")
+            subnet_ids = domain_response.get("SubnetIds", [])
+            logger.info(f"SageMaker domain VPC: {vpc_id}, Subnets: {subnet_ids}")
+        except Exception as e:
+            logger.warning(f"Could not describe SageMaker domain (may be deleted): {str(e)}")
+            logger.info("Will still attempt to find and clean up EFS file systems by tags")
+
+        # Find EFS file systems associated with SageMaker domain
+        # SageMaker creates EFS with ManagedByAmazonSageMakerResource tag; the tagging API returns only those,
+        # with their tags inline, instead of listing every file system and describing its tags one by one
+        paginator = tagging_client.get_paginator("get_resources")
+        candidates = [
+            resource
+            for page in paginator.paginate(
+                TagFilters=[{"Key": "ManagedByAmazonSageMakerResource"}],
+                ResourceTypeFilters=["elasticfilesystem:file-system"],
+            )
+            for resource in page.get("ResourceTagMappingList", [])
+        ]
+        deleted_fs_count = 0
+        logger.info(f"Found {len(candidates)} SageMaker-managed EFS file systems to check...")
+
+        for resource in candidates:
+            # ARN format: arn:aws:elasticfilesystem:region:account:file-system/fs-xxx
+            fs_id = resource["ResourceARN"].rsplit("/", 1)[-1]
+            try:
+                tags = {tag["Key"]: tag["Value"] for tag in resource.get("Tags", [])}
+                sagemaker_resource_arn = tags.get("ManagedByAmazonSageMakerResource", "")
+                logger.info(f"EFS {fs_id} has ManagedByAmazonSageMakerResource tag: {sagemaker_resource_arn}")
+
+                # Check if domain ID is in the ARN (e.g., "d-xyz" in "arn:aws:sagemaker:region:account:domain/d-xyz")
+                if sagemaker_domain_id not in sagemaker_resource_arn:
+                    logger.info(f"Found SageMaker EFS {fs_id} but domain ID doesn't match: {sagemaker_resource_arn}")
+                    continue
+
+                logger.info(f"✓ Identified SageMaker EFS {fs_id} for deletion (domain ID match)")
+
+                # Delete mount targets first (one per AZ, deleted concurrently)
+                mount_targets = efs_client.describe_mount_targets(FileSystemId=fs_id)
+                mt_ids = [mt["MountTargetId"] for mt in mount_targets.get("MountTargets", [])]
+
+                def delete_mount_target(mt_id):
+                    try:
+                        logger.info(f"Deleting mount target: {mt_id}")
+                        efs_client.delete_mount_target(MountTargetId=mt_id)
+                        return True
+                    except Exception as e:
+                        logger.warning(f"Could not delete mount target {mt_id}: {str(e)}")
+                        return False
+
+                with ThreadPoolExecutor(max_workers=DELETE_WORKERS) as executor:
+                    mt_deleted_count = sum(executor.map(delete_mount_target, mt_ids))
+
+                # Mount targets must be gone before the file system can be deleted
+                def mount_targets_deleted():
+                    try:
+                        return not efs_client.describe_mount_targets(FileSystemId=fs_id).get("MountTargets")
+                    except Exception as e:
+                        logger.info(f"Mount target check failed (may be deleted): {str(e)}")
+                        return True
+
+                if mt_deleted_count > 0:
+                    description = f"{mt_deleted_count} mount targets of {fs_id} to be deleted"
+                    # Deletes finish in seconds; cap the backoff so a late finish is noticed promptly
+                    if wait_until(mount_targets_deleted, description, timeout=120, max_delay=20):
+                        logger.info(f"All mount targets deleted for {fs_id}")
+
+                # Now delete the file system
+                try:
+                    logger.info(f"Deleting EFS file system: {fs_id}")
+
+                    # First, try to disable replication overwrite protection if enabled
+                    try:
+                        efs_client.put_file_system_protection(
+                            FileSystemId=fs_id, ReplicationOverwriteProtection="DISABLED"
+                        )
+                        logger.info(f"Disabled replication overwrite protection for {fs_id}")
+                    except Exception as e:
+                        # May not be enabled, or API may not be available
+                        logger.info(f"Could not disable replication protection (may not be enabled): {str(e)}")
+
+                    # Now attempt deletion
+                    efs_client.delete_file_system(FileSystemId=fs_id)
+                    logger.info(f"✓ EFS file system {fs_id} deletion initiated successfully")
+                    deleted_fs_count += 1
+                except Exception as e:
+                    logger.error(f"✗ Could not delete EFS {fs_id}: {str(e)}")
+
+            except Exception as e:
+                logger.warning(f"Error processing EFS {fs_id}: {str(e)}")
+
+        if deleted_fs_count > 0:
+            logger.info(f"Successfully initiated deletion of {deleted_fs_count} SageMaker EFS file systems")
+        else:
+            logger.info("No SageMaker EFS file systems found to delete")
+
+        # Clean up ENIs associated with SageMaker in the VPC
+        if vpc_id:
+            logger.info(f"Cleaning up SageMaker ENIs in VPC {vpc_id}...")
+            base_filters = [
+                {"Name": "vpc-id", "Values": [vpc_id]},
+                {"Name": "status", "Values": ["available"]},  # Only delete available ENIs
+            ]
+            # Results are paginated; walk every page so no ENI is left behind in busy VPCs
+            paginator = ec2_client.get_paginator("describe_network_interfaces")
+
+            def find_enis(extra_filter):
+                return [
+                    eni
+                    for page in paginator.paginate(Filters=base_filters + [extra_filter])
+                    for eni in page.get("NetworkInterfaces", [])
+                ]
+
+            # SageMaker tags the ENIs it manages; match on the tag key rather than a wildcard description scan
+            enis = find_enis({"Name": "tag-key", "Values": ["ManagedByAmazonSageMakerResource"]})
+            if not enis:
+                # Fall back to the description match for ENIs created without the tag
+                enis = find_enis({"Name": "description", "Values": ["*SageMaker*"]})
+            logger.info(f"Found {len(enis)} available SageMaker ENIs in VPC {vpc_id}")
+
+            for eni in enis:
+                eni_id = eni["NetworkInterfaceId"]
+                try:
+                    logger.info(f"Deleting ENI: {eni_id}")
+                    ec2_client.delete_network_interface(NetworkInterfaceId=eni_id)
+                except Exception as e:
+                    logger.warning(f"Could not delete ENI {eni_id}: {str(e)}")
+
+        logger.info("SageMaker EFS and ENI cleanup completed")
+
+    except Exception as e:
+        logger.warning(f"Could not clean up SageMaker EFS: {str(e)}")
+
+
+def handler(event, context):
+    """Handle stack cleanup during deletion."""
+    request_type = event.get("RequestType")
+    props = event.get("ResourceProperties", {})
+
+    stack_name = props.get("StackName")
+    db_cluster_identifier = props.get("DbClusterIdentifier")
+    backup_vault_name = props.get("BackupVaultName")
+    ses_rule_set_name = props.get("SesRuleSetName")
+    alb_arn = props.get("AlbArn")
+    sagemaker_domain_id = props.get("SageMakerDomainId")
+
+    logger.info(f"Cleanup handler called: {request_type}")
+    logger.info(f"Stack: {stack_name}")
+
+    try:
+        if request_type == "Delete":
+            targets = (db_cluster_identifier, alb_arn, ses_rule_set_name, backup_vault_name, sagemaker_domain_id)
+            if not any(targets):
+                logger.info("No cleanup targets supplied - nothing to do")
+                send_response(event, context, "SUCCESS", {"Message": "No cleanup targets supplied"})
+                return
+
+            logger.info("Starting cleanup operations for stack deletion...")
+
+            # The cleanups target independent services and are I/O bound, so run them concurrently.
+            # Clients are created here on the main thread: boto3 sessions are not thread-safe, clients are.
+            tasks = []
+            if db_cluster_identifier:
+                tasks.append((_cleanup_rds, client("rds"), db_cluster_identifier))
+            if alb_arn:
+                tasks.append((_cleanup_alb, client("elbv2"), alb_arn))
+            if ses_rule_set_name:
+                tasks.append((_cleanup_ses, client("ses"), ses_rule_set_name))
+            if backup_vault_name:
+                tasks.append((_cleanup_backup, client("backup"), backup_vault_name))
+            if sagemaker_domain_id:
+                tasks.append(
+                    (
+                        _cleanup_sagemaker,
+                        client("sagemaker"),
+                        client("efs"),
+                        client("ec2"),
+                        client("resourcegroupstaggingapi"),
+                        sagemaker_domain_id,
+                    )
+                )
+
+            with ThreadPoolExecutor(max_workers=len(tasks)) as executor:
+                futures = {executor.submit(task[0], *task[1:]): task[0].__name__ for task in tasks}
+                for future in as_completed(futures):
+                    try:
+                        future.result()
+                    except Exception as e:
+                        # Best effort: a failed cleanup must not block the others or the stack deletion
+                        logger.warning(f"{futures[future]} failed: {str(e)}")
+
+            logger.info("Cleanup operations completed successfully")
+
+        # For Create and Update, just acknowledge success
+        send_response(event, context, "SUCCESS", {"Message": f"Cleanup resource {request_type}d successfully"})
+
+    except Exception as e:
+        logger.error(f"Cleanup failed: {str(e)}", exc_info=True)
+        # On Delete, we still want to signal success to allow stack deletion to continue
+        # Other resources will be cleaned up by CloudFormation itself
+        if request_type == "Delete":
+            send_response(
+                event, context, "SUCCESS", {"Message": f"Cleanup attempted (some operations may have failed): {str(e)}"}
+            )
+        else:
+            send_response(event, context, "FAILED", {}, reason=str(e))
@@ -1,31 +1,257 @@
 """Analytics infrastructure: SageMaker Studio, EMR Serverless, and data export functions."""
 
+import functools
 import hashlib
-from typing import Optional
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Optional
 
 from aws_cdk import (
+    ArnFormat,
     Duration,
+    Fn,
     RemovalPolicy,
     Stack,
 )
 from aws_cdk import aws_ec2 as ec2
 from aws_cdk import aws_ecs as ecs
 from aws_cdk import aws_efs as efs
-from aws_cdk import aws_emrserverless as emrserverless
 from aws_cdk import aws_iam as iam
 from aws_cdk import aws_kms as kms
 from aws_cdk import aws_lambda as _lambda
 from aws_cdk import aws_s3 as s3
-from aws_cdk import aws_sagemaker as sagemaker
-from cdk_nag import NagSuppressions
-from constructs import Construct
+from constructs import Construct, IConstruct
 
 from .nag_suppressions import (
+    NAG_ENABLED,
+    add_resource_suppressions,
     suppress_lambda_common_findings,
     suppress_lambda_role_common_findings,
     suppress_sagemaker_role_findings,
     suppress_vpc_endpoint_security_group_findings,
 )
+from .utils import LAMBDA_FUNCTIONS_ASSET_EXCLUDE, default_policy_resource
+
+if TYPE_CHECKING:
+    from aws_cdk import aws_emrserverless as emrserverless
+    from aws_cdk import aws_sagemaker as sagemaker
+
+# AWS managed policies attached to the SageMaker execution role
+_SAGEMAKER_MANAGED_POLICIES = (
+    "AmazonSageMakerFullAccess",
+    "AmazonSageMakerClusterInstanceRolePolicy",
+    "AmazonSageMakerFeatureStoreAccess",
+    "AmazonSageMakerModelGovernanceUseAccess",
+    "AmazonSageMakerModelRegistryFullAccess",
+    "AmazonSageMakerGroundTruthExecution",
+    "AmazonSageMakerPipelinesIntegrations",
+    "AmazonSageMakerCanvasFullAccess",
+)
+
+# Glue Data Catalog actions EMR Serverless needs for the analytics databases and tables
+_GLUE_CATALOG_ACTIONS = (
+    "glue:GetDatabase",
+    "glue:CreateDatabase",
+    "glue:GetDataBases",
+    "glue:CreateTable",
+    "glue:GetTable",
+    "glue:UpdateTable",
+    "glue:DeleteTable",
+    "glue:GetTables",
+    "glue:GetPartition",
+    "glue:GetPartitions",
+    "glue:CreatePartition",
+    "glue:BatchCreatePartition",
+    "glue:GetUserDefinedFunctions",
+)
+
+# KMS grant-management actions the export task, export Lambda and SageMaker role need on the analytics key
+_KMS_GRANT_ACTIONS = (
+    "kms:CreateGrant",
+    "kms:ListGrants",
+    "kms:RevokeGrant",
+    "kms:GenerateDataKeyWithoutPlaintext",
+    "kms:DescribeKey",
+    "kms:RetireGrant",
+)
+
+# ECR read actions for pulling custom container images into SageMaker/EMR Serverless
+_ECR_IMAGE_READ_ACTIONS = ("ecr:GetDownloadUrlForLayer", "ecr:BatchGetImage", "ecr:DescribeImages")
+
+# Tags SageMaker Studio puts on the EMR Serverless applications it manages
+_SAGEMAKER_TAG_KEYS = ("sagemaker:domain-arn", "sagemaker:user-profile-arn", "sagemaker:space-arn")
+
+# Null-condition blocks shared by the EMR Serverless statements (treat as read-only)
+_NULL_REQUEST_TAGS_FALSE = {f"aws:RequestTag/{key}": "false" for key in _SAGEMAKER_TAG_KEYS}
+_NULL_RESOURCE_TAGS_TRUE = {f"aws:ResourceTag/{key}": "true" for key in _SAGEMAKER_TAG_KEYS}
+_NULL_RESOURCE_TAGS_FALSE = {f"aws:ResourceTag/{key}": "false" for key in _SAGEMAKER_TAG_KEYS}
+
+# EMR Serverless statements for the SageMaker role as (sid, effect, actions, resource suffix, conditions).
+# The suffix is the ARN resource part after "arn:<partition>:emr-serverless:<region>:<account>:";
+# {app_id} is replaced with the application ID.
+_EMR_SERVERLESS_STATEMENT_SPECS = (
+    # EMR Serverless application access
+    (
+        None,
+        iam.Effect.ALLOW,
+        (
+            "emr-serverless:StartApplication",
+            "emr-serverless:StopApplication",
+            "emr-serverless:UpdateApplication",
+            "emr-serverless:RunJob",
+            "emr-serverless:CancelJobRun",
+            "emr-serverless:GetJobRun",
+            "emr-serverless:GetApplication",
+            "emr-serverless:AccessLivyEndpoints",
+            "emr-serverless:GetDashboardForJobRun",
+        ),
+        "applications/{app_id}",
+        None,
+    ),
+    # List applications
+    ("EMRServerlessUnTaggedActions", iam.Effect.ALLOW, ("emr-serverless:ListApplications",), "/*", None),
+    # Create and tag EMR Serverless applications
+    (
+        "EMRServerlessCreateApplicationAction",
+        iam.Effect.ALLOW,
+        ("emr-serverless:CreateApplication", "emr-serverless:TagResource"),
+        "/*",
+        {
+            "ForAllValues:StringEquals": {"aws:TagKeys": list(_SAGEMAKER_TAG_KEYS)},
+            "Null": _NULL_REQUEST_TAGS_FALSE,
+        },
+    ),
+    # Restrictive tagging policy
+    (
+        "EMRServerlessDenyPermissiveTaggingAction",
+        iam.Effect.DENY,
+        ("emr-serverless:TagResource", "emr-serverless:UntagResource"),
+        "/*",
+        {"Null": _NULL_RESOURCE_TAGS_TRUE},
+    ),
+    # Additional EMR Serverless actions
+    (
+        "EMRServerlessActions",
+        iam.Effect.ALLOW,
+        (
+            "emr-serverless:StartApplication",
+            "emr-serverless:StopApplication",
+            "emr-serverless:GetApplication",
+            "emr-serverless:DeleteApplication",
+            "emr-serverless:AccessLivyEndpoints",
+            "emr-serverless:GetDashboardForJobRun",
+        ),
+        "/applications/*",
+        {"Null": _NULL_RESOURCE_TAGS_FALSE},
+    ),
+)
+
+# Shell command run by the EFS-to-S3 sync task; ${BucketName} is filled in by Fn::Sub
+_EFS_SYNC_COMMAND_TEMPLATE = (
+    "apk add --no-cache aws-cli && aws s3 sync /var/www/localhost/htdocs/openemr/sites/ s3://${BucketName}"
+)
+
+# appliesTo entries for the S3/KMS action wildcards CDK emits for grant_read_write on a KMS-encrypted bucket
+_S3_KMS_WILDCARD_APPLIES_TO = (
+    "Action::s3:Abort*",
+    "Action::s3:DeleteObject*",
+    "Action::s3:GetBucket*",
+    "Action::s3:GetObject*",
+    "Action::s3:List*",
+    "Action::kms:GenerateDataKey*",
+    "Action::kms:ReEncrypt*",
+)
+
+# appliesTo entries for the export bucket objects and export Lambda versions (CDK logical IDs)
+_RDS_EXPORT_OBJECTS_APPLIES_TO = "Resource::<S3ExportBucket658E7E06.Arn>/*"
+_EFS_EXPORT_OBJECTS_APPLIES_TO = "Resource::<EFSExportBucketB8FC2AFD.Arn>/*"
+_RDS_EXPORT_LAMBDA_VERSIONS_APPLIES_TO = "Resource::<RDStoS3ExportLambda651B6E3D.Arn>:*"
+_EFS_EXPORT_LAMBDA_VERSIONS_APPLIES_TO = "Resource::<EFStoS3ExportLambda9ED3EC88.Arn>:*"
+
+# EMR Serverless policy suppressions. The IAM5 entry is scoped to the wildcard resources the policy
+# actually uses. cdk-nag renders unresolved parts as tokens (arn:<AWS::Partition>:emr-serverless:<AWS::Region>:...),
+# so the regexes accept any partition, region and account rather than literal ARN segments.
+_EMR_SERVERLESS_POLICY_SUPPRESSIONS = (
+    {
+        "id": "AwsSolutions-IAM5",
+        "reason": "Wildcard permissions for EMR Serverless applications (arn:aws:emr-serverless:*:*/applications/*), ECR images (arn:aws:ecr:*:*/*), and ECS DescribeTasks are required for SageMaker Studio data science workflows. See docs/cdk-nag-suppressions.md.",
+        "appliesTo": [
+            {"regex": "/^Resource::arn:.*:emr-serverless:.*\\*$/g"},
+            {"regex": "/^Resource::arn:.*:ecr:.*\\*$/g"},
+            "Resource::*",
+        ],
+    },
+    {
+        "id": "HIPAA.Security-IAMNoInlinePolicy",
+        "reason": "Inline policy is required for EMR Serverless and data science workflow permissions - provides least-privilege access for SageMaker Studio",
+    },
+)
+
+_RDS_EXPORT_BUCKET_SUPPRESSIONS = (
+    {
+        "id": "AwsSolutions-S1",
+        "reason": "RDS export bucket is for analytics data - already has access logs via analytics_access_logs_bucket",
+    },
+    {
+        "id": "HIPAA.Security-S3BucketLoggingEnabled",
+        "reason": "RDS export bucket is for analytics data - already has access logs via analytics_access_logs_bucket",
+    },
+    {
+        "id": "HIPAA.Security-S3BucketReplicationEnabled",
+        "reason": "RDS export bucket stores analytics exports - replication not required as data can be re-exported from source database",
+    },
+)
+
+_EFS_EXPORT_BUCKET_SUPPRESSIONS = (
+    {
+        "id": "AwsSolutions-S1",
+        "reason": "EFS export bucket is for analytics data - already has access logs via analytics_access_logs_bucket",
+    },
+    {
+        "id": "HIPAA.Security-S3BucketLoggingEnabled",
+        "reason": "EFS export bucket is for analytics data - already has access logs via analytics_access_logs_bucket",
+    },
+    {
+        "id": "HIPAA.Security-S3BucketReplicationEnabled",
+        "reason": "EFS export bucket stores analytics exports - replication not required as data can be re-exported from source EFS",
+    },
+)
+
+
+@functools.lru_cache(maxsize=None)
+def _managed_policy(policy_name: str) -> iam.IManagedPolicy:
+    """Return a shared reference to an AWS managed policy.
+
+    The reference is not scoped to a construct, so one object can be attached to any number of roles.
+    """
+    return iam.ManagedPolicy.from_aws_managed_policy_name(policy_name)
+
+
+@functools.lru_cache(maxsize=None)
+def _service_principal(service: str) -> iam.ServicePrincipal:
+    """Return a shared ServicePrincipal for an AWS service (principals are immutable, so reuse is safe)."""
+    return iam.ServicePrincipal(service)
+
+
+@functools.lru_cache(maxsize=None)
+def _unique_id(node_addr: str) -> str:
+    """Return the 18-character naming suffix for a CDK node address (computed once per address).
+
+    MD5 is used only for non-cryptographic purposes (naming), not security. The digest feeds
+    physical names (KMS alias, buckets, roles), so changing the algorithm would replace those resources.
+    """
+    return hashlib.md5(node_addr.encode("utf-8"), usedforsecurity=False).hexdigest()[:18]
+
+
+@dataclass(frozen=True, slots=True)
+class AnalyticsOutputs:
+    """Resources created by AnalyticsComponents.create_serverless_analytics_environment."""
+
+    analytics_kms_key: kms.Key
+    export_bucket_rds: s3.Bucket
+    export_bucket_efs: s3.Bucket
+    sagemaker_domain: "sagemaker.CfnDomain"
+    sagemaker_user: "sagemaker.CfnUserProfile"
+    emr_app: "emrserverless.CfnApplication"
 
 
 class AnalyticsComponents:
@@ -40,6 +266,16 @@ class AnalyticsComponents:
     - VPC endpoints for SageMaker
     """
 
+    __slots__ = (
+        "scope",
+        "analytics_kms_key",
+        "export_bucket_rds",
+        "export_bucket_efs",
+        "sagemaker_api_interface_endpoint",
+        "sagemaker_runtime_interface_endpoint",
+        "_stack",
+    )
+
     def __init__(self, scope: Construct):
         """Initialize analytics components.
 
@@ -52,6 +288,33 @@ class AnalyticsComponents:
         self.export_bucket_efs: Optional[s3.Bucket] = None
         self.sagemaker_api_interface_endpoint: Optional[ec2.InterfaceVpcEndpoint] = None
         self.sagemaker_runtime_interface_endpoint: Optional[ec2.InterfaceVpcEndpoint] = None
+        self._stack: Optional[Stack] = None
+
+    def unique_id(self, node_addr: str) -> str:
+        """Return the naming suffix derived from a CDK node address.
+
+        SageMaker requires "SageMaker" in resource names, so this suffix keeps them unique per stack.
+        The digest is cached per address, so repeated calls with the same address hash only once.
+
+        Args:
+            node_addr: CDK node address for unique ID generation
+
+        Returns:
+            18-character hexadecimal suffix
+        """
+        return _unique_id(node_addr)
+
+    @property
+    def stack(self) -> Stack:
+        """Stack that owns these components (looked up once instead of walking the construct tree each time)."""
+        if self._stack is None:
+            self._stack = Stack.of(self.scope)
+        return self._stack
+
+    @property
+    def stack_name(self) -> str:
+        """Name of the stack that owns these components."""
+        return self.stack.stack_name
 
     def create_serverless_analytics_environment(
         self,
@@ -69,7 +332,9 @@ class AnalyticsComponents:
         account: str,
         region: str,
         node_addr: str,
-    ) -> dict:
+        enabled: bool = True,
+        create_sagemaker_vpc_endpoints: bool = True,
+    ) -> Optional[AnalyticsOutputs]:
         """Provision optional analytics tooling (SageMaker Studio, EMR Serverless, and exports).
 
         Args:
@@ -87,13 +352,30 @@ class AnalyticsComponents:
             account: AWS account ID
             region: AWS region
             node_addr: CDK node address for unique ID generation
+            enabled: Whether analytics is enabled; when False nothing is created
+            create_sagemaker_vpc_endpoints: Whether to create the SageMaker API/Runtime interface endpoints;
+                when False, SageMaker traffic from the private subnets goes through the NAT gateway
 
         Returns:
-            Dictionary with analytics resources
+            AnalyticsOutputs with the analytics resources, or None when analytics is disabled
         """
+        if not enabled:
+            return None
+
+        # Imported lazily: these jsii submodules are only needed when analytics is enabled
+        from aws_cdk import aws_emrserverless as emrserverless
+        from aws_cdk import aws_sagemaker as sagemaker
+
+        # Nag suppressions are collected while resources are created and applied in one pass at the end
+        pending_suppressions: list = []
+
+        def suppress(construct: IConstruct, suppressions: list, apply_to_children: bool = False) -> None:
+            if NAG_ENABLED:
+                pending_suppressions.append((construct, suppressions, apply_to_children))
+
         # Generate unique ID for naming (SageMaker requires "SageMaker" in names)
-        # Note: MD5 is used only for non-cryptographic purposes (naming), not security
-        unique_id = hashlib.md5(bytes(f"{node_addr}", "utf-8"), usedforsecurity=False).hexdigest().lower()[:18]
+        unique_id = self.unique_id(node_addr)
+        stack_name = self.stack_name
 
         # Create KMS key for analytics environment encryption
         # Set removal policy to DESTROY to schedule key deletion when stack is deleted
@@ -106,106 +388,77 @@ class AnalyticsComponents:
             removal_policy=RemovalPolicy.DESTROY,
             pending_window=Duration.days(7),  # Minimum waiting period before key deletion
         )
-        self.analytics_kms_key.grant_encrypt_decrypt(iam.ServicePrincipal(f"logs.{region}.amazonaws.com"))
-        self.analytics_kms_key.grant_encrypt_decrypt(iam.ServicePrincipal("export.rds.amazonaws.com"))
-        self.analytics_kms_key.grant_encrypt_decrypt(iam.ServicePrincipal("rds.amazonaws.com"))
-        self.analytics_kms_key.grant_encrypt_decrypt(iam.ServicePrincipal("sagemaker.amazonaws.com"))
-        self.analytics_kms_key.grant_encrypt_decrypt(iam.ServicePrincipal("elasticfilesystem.amazonaws.com"))
+
+        # Allow the analytics services to use the key (one statement instead of a grant per service)
+        self.analytics_kms_key.add_to_resource_policy(
+            iam.PolicyStatement(
+                sid="Allow Analytics Services",
+                principals=[
+                    _service_principal(f"logs.{region}.amazonaws.com"),
+                    _service_principal("export.rds.amazonaws.com"),
+                    _service_principal("rds.amazonaws.com"),
+                    _service_principal("sagemaker.amazonaws.com"),
+                    _service_principal("elasticfilesystem.amazonaws.com"),
+                ],
+                actions=["kms:Encrypt", "kms:Decrypt", "kms:ReEncrypt*", "kms:GenerateDataKey*"],
+                resources=["*"],
+            )
+        )
 
         # Create KMS policy statement for integration
         kms_policy_statement = iam.PolicyStatement(
             effect=iam.Effect.ALLOW,
-            actions=[
-                "kms:CreateGrant",
-                "kms:ListGrants",
-                "kms:RevokeGrant",
-                "kms:GenerateDataKeyWithoutPlaintext",
-                "kms:DescribeKey",
-                "kms:RetireGrant",
-            ],
+            actions=list(_KMS_GRANT_ACTIONS),
             resources=[self.analytics_kms_key.key_arn],
         )
 
-        # Create S3 bucket for RDS exports
-        self.export_bucket_rds = s3.Bucket(
-            self.scope,
-            "S3ExportBucket",
+        # Settings shared by both export buckets (keeps them in sync)
+        export_bucket_kwargs = dict(
             auto_delete_objects=True,
             removal_policy=RemovalPolicy.DESTROY,
-            bucket_name=f"sagemaker-rds-export-{unique_id}-{account}-{region}",
             encryption_key=self.analytics_kms_key,
             block_public_access=s3.BlockPublicAccess.BLOCK_ALL,
             enforce_ssl=True,
             versioned=True,
         )
 
-        # Add suppressions for RDS export bucket
-        NagSuppressions.add_resource_suppressions(
-            self.export_bucket_rds,
-            [
-                {
-                    "id": "AwsSolutions-S1",
-                    "reason": "RDS export bucket is for analytics data - already has access logs via analytics_access_logs_bucket",
-                },
-                {
-                    "id": "HIPAA.Security-S3BucketLoggingEnabled",
-                    "reason": "RDS export bucket is for analytics data - already has access logs via analytics_access_logs_bucket",
-                },
-                {
-                    "id": "HIPAA.Security-S3BucketReplicationEnabled",
-                    "reason": "RDS export bucket stores analytics exports - replication not required as data can be re-exported from source database",
-                },
-            ],
+        # Create S3 bucket for RDS exports
+        self.export_bucket_rds = s3.Bucket(
+            self.scope,
+            "S3ExportBucket",
+            bucket_name=f"sagemaker-rds-export-{unique_id}-{account}-{region}",
+            **export_bucket_kwargs,
         )
 
+        # Add suppressions for RDS export bucket
+        suppress(self.export_bucket_rds, list(_RDS_EXPORT_BUCKET_SUPPRESSIONS))
+
         # Create S3 bucket for EFS exports
         self.export_bucket_efs = s3.Bucket(
             self.scope,
             "EFSExportBucket",
-            auto_delete_objects=True,
-            removal_policy=RemovalPolicy.DESTROY,
             bucket_name=f"sagemaker-efs-export-{unique_id}-{account}-{region}",
-            encryption_key=self.analytics_kms_key,
-            block_public_access=s3.BlockPublicAccess.BLOCK_ALL,
-            enforce_ssl=True,
-            versioned=True,
+            **export_bucket_kwargs,
         )
 
         # Add suppressions for EFS export bucket
-        NagSuppressions.add_resource_suppressions(
-            self.export_bucket_efs,
-            [
-                {
-                    "id": "AwsSolutions-S1",
-                    "reason": "EFS export bucket is for analytics data - already has access logs via analytics_access_logs_bucket",
-                },
-                {
-                    "id": "HIPAA.Security-S3BucketLoggingEnabled",
-                    "reason": "EFS export bucket is for analytics data - already has access logs via analytics_access_logs_bucket",
-                },
-                {
-                    "id": "HIPAA.Security-S3BucketReplicationEnabled",
-                    "reason": "EFS export bucket stores analytics exports - replication not required as data can be re-exported from source EFS",
-                },
-            ],
-        )
+        suppress(self.export_bucket_efs, list(_EFS_EXPORT_BUCKET_SUPPRESSIONS))
 
-        # Get private subnet IDs
+        # Get private subnet IDs (list for SageMaker, comma-separated for the export Lambda)
         private_subnets_ids = [ps.subnet_id for ps in vpc.private_subnets]
+        private_subnet_id_string = ",".join(private_subnets_ids)
 
         # Create IAM role for Aurora database to export to S3
         aurora_s3_export_role = iam.Role(
             self.scope,
             "AuroraExportRole",
-            assumed_by=iam.ServicePrincipal("export.rds.amazonaws.com"),
+            assumed_by=_service_principal("export.rds.amazonaws.com"),
         )
         self.export_bucket_rds.grant_read_write(aurora_s3_export_role)
-        aurora_s3_export_role.add_managed_policy(
-            iam.ManagedPolicy.from_aws_managed_policy_name("AmazonRDSDataFullAccess")
-        )
+        aurora_s3_export_role.add_managed_policy(_managed_policy("AmazonRDSDataFullAccess"))
 
         # Suppress Aurora export role findings
-        NagSuppressions.add_resource_suppressions(
+        suppress(
             aurora_s3_export_role,
             [
                 {
@@ -216,16 +469,7 @@ class AnalyticsComponents:
                 {
                     "id": "AwsSolutions-IAM5",
                     "reason": "S3 and KMS wildcard permissions required for RDS export operations",
-                    "appliesTo": [
-                        "Action::s3:Abort*",
-                        "Action::s3:DeleteObject*",
-                        "Action::s3:GetBucket*",
-                        "Action::s3:GetObject*",
-                        "Action::s3:List*",
-                        "Action::kms:GenerateDataKey*",
-                        "Action::kms:ReEncrypt*",
-                        "Resource::<S3ExportBucket658E7E06.Arn>/*",
-                    ],
+                    "appliesTo": [*_S3_KMS_WILDCARD_APPLIES_TO, _RDS_EXPORT_OBJECTS_APPLIES_TO],
                 },
                 {
                     "id": "HIPAA.Security-IAMNoInlinePolicy",
@@ -240,13 +484,12 @@ class AnalyticsComponents:
             self.scope,
             "SageMakerExecutionRole",
             role_name=f"AmazonSageMakerSMRole{unique_id}{account}{region}",
-            assumed_by=iam.ServicePrincipal("sagemaker.amazonaws.com"),
+            assumed_by=_service_principal("sagemaker.amazonaws.com"),
         )
         self.export_bucket_rds.grant_read_write(sagemaker_role)
         self.export_bucket_efs.grant_read_write(sagemaker_role)
 
         # Create EMR Serverless application
-        stack_name = Stack.of(self.scope).stack_name
         emr_app = emrserverless.CfnApplication(
             self.scope,
             "EMRServerlessApp",
@@ -292,9 +535,13 @@ class AnalyticsComponents:
             name="SitesFolderVolume", efs_volume_configuration=efs_volume_configuration_for_sites_folder
         )
 
-        # Script to sync EFS to S3
-        command_array = [f"apk add --no-cache aws-cli && \
-            aws s3 sync /var/www/localhost/htdocs/openemr/sites/ s3://{self.export_bucket_efs.bucket_name}"]
+        # Script to sync EFS to S3 (bucket name substituted by CloudFormation)
+        command_array = [
+            Fn.sub(
+                _EFS_SYNC_COMMAND_TEMPLATE,
+                {"BucketName": self.export_bucket_efs.bucket_name},
+            )
+        ]
 
         # Add container definition (this creates the execution role's DefaultPolicy)
         sync_efs_to_s3_container = sync_efs_to_s3_task.add_container(
@@ -309,7 +556,7 @@ class AnalyticsComponents:
         )
 
         # Suppress execution role inline policy (after container creates DefaultPolicy)
-        NagSuppressions.add_resource_suppressions(
+        suppress(
             sync_efs_to_s3_task.execution_role,
             [
                 {
@@ -326,12 +573,15 @@ class AnalyticsComponents:
         )
         sync_efs_to_s3_container.add_mount_points(efs_mount_point)
 
+        # Both export Lambdas ship the same lambda/ directory; fingerprint it once
+        lambda_code = _lambda.Code.from_asset("lambda", exclude=LAMBDA_FUNCTIONS_ASSET_EXCLUDE)
+
         # Create Lambda for EFS to S3 export
         export_efs_to_s3_lambda = _lambda.Function(
             self.scope,
             "EFStoS3ExportLambda",
             runtime=lambda_python_runtime,
-            code=_lambda.Code.from_asset("lambda"),
+            code=lambda_code,
             architecture=_lambda.Architecture.ARM_64,
             handler="lambda_functions.sync_efs_to_s3",
             timeout=Duration.minutes(10),
@@ -343,7 +593,6 @@ class AnalyticsComponents:
         )
         suppress_lambda_role_common_findings(export_efs_to_s3_lambda.role, role_type="ecs_task")
 
-        private_subnet_id_string = ",".join(private_subnets_ids)
         export_efs_to_s3_lambda.add_environment("ECS_CLUSTER", ecs_cluster.cluster_arn)
         export_efs_to_s3_lambda.add_environment("TASK_DEFINITION", sync_efs_to_s3_task.task_definition_arn)
         export_efs_to_s3_lambda.add_environment("SUBNETS", private_subnet_id_string)
@@ -358,26 +607,16 @@ class AnalyticsComponents:
 
         # Grant permissions (this creates DefaultPolicy for the Lambda and task role)
         self.export_bucket_efs.grant_read_write(sync_efs_to_s3_task.task_role)
-        sync_efs_to_s3_task.task_role.add_to_principal_policy(kms_policy_statement)
         sync_efs_to_s3_task.grant_run(export_efs_to_s3_lambda.grant_principal)
 
         # Suppress task role inline policy (after grants create DefaultPolicy)
-        NagSuppressions.add_resource_suppressions(
+        suppress(
             sync_efs_to_s3_task.task_role,
             [
                 {
                     "id": "AwsSolutions-IAM5",
                     "reason": "Wildcard permissions for S3 sync operations (s3:GetBucket*, s3:GetObject*, s3:List*, s3:Abort*, s3:DeleteObject*, kms:GenerateDataKey*, kms:ReEncrypt*) and EFS bucket resource (/*) are required for EFS to S3 sync functionality",
-                    "appliesTo": [
-                        "Action::s3:Abort*",
-                        "Action::s3:DeleteObject*",
-                        "Action::s3:GetBucket*",
-                        "Action::s3:GetObject*",
-                        "Action::s3:List*",
-                        "Resource::<EFSExportBucketB8FC2AFD.Arn>/*",
-                        "Action::kms:GenerateDataKey*",
-                        "Action::kms:ReEncrypt*",
-                    ],
+                    "appliesTo": [*_S3_KMS_WILDCARD_APPLIES_TO, _EFS_EXPORT_OBJECTS_APPLIES_TO],
                 },
                 {
                     "id": "HIPAA.Security-IAMNoInlinePolicy",
@@ -388,8 +627,8 @@ class AnalyticsComponents:
         )
 
         # Add inline policy suppression for EFS export Lambda (after grants create DefaultPolicy)
-        NagSuppressions.add_resource_suppressions(
-            export_efs_to_s3_lambda.role.node.find_child("DefaultPolicy").node.find_child("Resource"),
+        suppress(
+            default_policy_resource(export_efs_to_s3_lambda.role),
             [
                 {
                     "id": "HIPAA.Security-IAMNoInlinePolicy",
@@ -403,7 +642,7 @@ class AnalyticsComponents:
             iam.PolicyStatement(
                 actions=["s3:*"],
                 resources=[self.export_bucket_rds.bucket_arn, f"{self.export_bucket_rds.bucket_arn}/*"],
-                principals=[iam.ServicePrincipal("export.rds.amazonaws.com")],
+                principals=[_service_principal("export.rds.amazonaws.com")],
             )
         )
         self.export_bucket_rds.add_to_resource_policy(
@@ -419,7 +658,7 @@ class AnalyticsComponents:
             self.scope,
             "RDStoS3ExportLambda",
             runtime=lambda_python_runtime,
-            code=_lambda.Code.from_asset("lambda"),
+            code=lambda_code,
             architecture=_lambda.Architecture.ARM_64,
             handler="lambda_functions.export_from_rds_to_s3",
             timeout=Duration.minutes(10),
@@ -431,15 +670,14 @@ class AnalyticsComponents:
         )
         suppress_lambda_role_common_findings(export_rds_to_s3_lambda.role, role_type="basic")
 
-        # Grant KMS permissions (this creates DefaultPolicy for the Lambda)
+        # Grant KMS permissions (this creates DefaultPolicy for the Lambda).
+        # The Aurora export, SageMaker and EFS sync task roles already receive encrypt/decrypt on this key
+        # from grant_read_write on the KMS-encrypted export buckets, so only the Lambda needs an explicit grant.
         self.analytics_kms_key.grant_encrypt_decrypt(export_rds_to_s3_lambda.grant_principal)
-        self.analytics_kms_key.grant_encrypt_decrypt(aurora_s3_export_role)
-        self.analytics_kms_key.grant_encrypt_decrypt(sagemaker_role)
-        self.analytics_kms_key.grant_encrypt_decrypt(sync_efs_to_s3_task.task_role)
 
         # Add inline policy suppression for RDS export Lambda (after grants create DefaultPolicy)
-        NagSuppressions.add_resource_suppressions(
-            export_rds_to_s3_lambda.role.node.find_child("DefaultPolicy").node.find_child("Resource"),
+        suppress(
+            default_policy_resource(export_rds_to_s3_lambda.role),
             [
                 {
                     "id": "AwsSolutions-IAM5",
@@ -472,7 +710,23 @@ class AnalyticsComponents:
                 effect=iam.Effect.ALLOW, actions=["iam:PassRole"], resources=[aurora_s3_export_role.role_arn]
             )
         )
-        export_rds_to_s3_lambda.add_to_role_policy(kms_policy_statement)
+
+        # KMS grant-management permissions shared by the EFS sync task and the RDS export Lambda.
+        # One policy attached to both roles instead of copying the statement into each DefaultPolicy.
+        shared_kms_policy = iam.Policy(self.scope, "SharedKmsPolicy", statements=[kms_policy_statement])
+        shared_kms_policy.attach_to_role(sync_efs_to_s3_task.task_role)
+        # Function.role is Optional; CDK always creates one when no role is passed in
+        assert export_rds_to_s3_lambda.role is not None
+        shared_kms_policy.attach_to_role(export_rds_to_s3_lambda.role)
+        suppress(
+            shared_kms_policy,
+            [
+                {
+                    "id": "HIPAA.Security-IAMNoInlinePolicy",
+                    "reason": "Inline policy scoped to the analytics KMS key ARN - grants export task and Lambda the KMS grant operations needed for encrypted exports",
+                },
+            ],
+        )
 
         # Grant Lambda invoke permissions
         export_efs_to_s3_lambda.grant_invoke(sagemaker_role)
@@ -480,17 +734,17 @@ class AnalyticsComponents:
 
         # Apply SageMaker role suppressions after all grants create DefaultPolicy
         suppress_sagemaker_role_findings(sagemaker_role)
-        NagSuppressions.add_resource_suppressions(
-            sagemaker_role.node.find_child("DefaultPolicy").node.find_child("Resource"),
+        suppress(
+            default_policy_resource(sagemaker_role),
             [
                 {
                     "id": "AwsSolutions-IAM5",
                     "reason": "Wildcard permissions are necessary for SageMaker role to access S3 buckets and invoke Lambda functions for analytics operations",
                     "appliesTo": [
-                        "Resource::<EFSExportBucketB8FC2AFD.Arn>/*",
-                        "Resource::<S3ExportBucket658E7E06.Arn>/*",
-                        "Resource::<EFStoS3ExportLambda9ED3EC88.Arn>:*",
-                        "Resource::<RDStoS3ExportLambda651B6E3D.Arn>:*",
+                        _EFS_EXPORT_OBJECTS_APPLIES_TO,
+                        _RDS_EXPORT_OBJECTS_APPLIES_TO,
+                        _EFS_EXPORT_LAMBDA_VERSIONS_APPLIES_TO,
+                        _RDS_EXPORT_LAMBDA_VERSIONS_APPLIES_TO,
                     ],
                 },
             ],
@@ -519,27 +773,13 @@ class AnalyticsComponents:
             self.scope,
             "GlueRoleForEMRServerless",
             role_name=f"AmazonSageMakerGlueRole{unique_id}{account}{region}",
-            assumed_by=iam.ServicePrincipal("emr-serverless.amazonaws.com"),
+            assumed_by=_service_principal("emr-serverless.amazonaws.com"),
             description="IAM Role with Glue permissions for EMR Serverless",
         )
-        glue_role.add_managed_policy(iam.ManagedPolicy.from_aws_managed_policy_name("service-role/AWSGlueServiceRole"))
+        glue_role.add_managed_policy(_managed_policy("service-role/AWSGlueServiceRole"))
         glue_role.add_to_policy(
             iam.PolicyStatement(
-                actions=[
-                    "glue:GetDatabase",
-                    "glue:CreateDatabase",
-                    "glue:GetDataBases",
-                    "glue:CreateTable",
-                    "glue:GetTable",
-                    "glue:UpdateTable",
-                    "glue:DeleteTable",
-                    "glue:GetTables",
-                    "glue:GetPartition",
-                    "glue:GetPartitions",
-                    "glue:CreatePartition",
-                    "glue:BatchCreatePartition",
-                    "glue:GetUserDefinedFunctions",
-                ],
+                actions=list(_GLUE_CATALOG_ACTIONS),
                 resources=["*"],
             )
         )
@@ -547,7 +787,7 @@ class AnalyticsComponents:
         self.export_bucket_efs.grant_read_write(glue_role)
 
         # Add suppressions for Glue role (AWS managed policy + inline policy for Glue operations)
-        NagSuppressions.add_resource_suppressions(
+        suppress(
             glue_role,
             [
                 {
@@ -560,15 +800,9 @@ class AnalyticsComponents:
                     "reason": "Wildcard permissions for Glue data catalog operations (Resource::*) and S3 bucket access are required for EMR Serverless data processing and analytics workflows",
                     "appliesTo": [
                         "Resource::*",
-                        "Action::s3:Abort*",
-                        "Action::s3:DeleteObject*",
-                        "Action::s3:GetBucket*",
-                        "Action::s3:GetObject*",
-                        "Action::s3:List*",
-                        "Resource::<EFSExportBucketB8FC2AFD.Arn>/*",
-                        "Resource::<S3ExportBucket658E7E06.Arn>/*",
-                        "Action::kms:GenerateDataKey*",
-                        "Action::kms:ReEncrypt*",
+                        *_S3_KMS_WILDCARD_APPLIES_TO,
+                        _EFS_EXPORT_OBJECTS_APPLIES_TO,
+                        _RDS_EXPORT_OBJECTS_APPLIES_TO,
                     ],
                 },
                 {
@@ -580,146 +814,60 @@ class AnalyticsComponents:
         )
 
         # Add SageMaker managed policies
-        sagemaker_role.add_managed_policy(iam.ManagedPolicy.from_aws_managed_policy_name("AmazonSageMakerFullAccess"))
-        sagemaker_role.add_managed_policy(
-            iam.ManagedPolicy.from_aws_managed_policy_name("AmazonSageMakerClusterInstanceRolePolicy")
-        )
-        sagemaker_role.add_managed_policy(
-            iam.ManagedPolicy.from_aws_managed_policy_name("AmazonSageMakerFeatureStoreAccess")
-        )
-        sagemaker_role.add_managed_policy(
-            iam.ManagedPolicy.from_aws_managed_policy_name("AmazonSageMakerModelGovernanceUseAccess")
-        )
-        sagemaker_role.add_managed_policy(
-            iam.ManagedPolicy.from_aws_managed_policy_name("AmazonSageMakerModelRegistryFullAccess")
-        )
-        sagemaker_role.add_managed_policy(
-            iam.ManagedPolicy.from_aws_managed_policy_name("AmazonSageMakerGroundTruthExecution")
-        )
-        sagemaker_role.add_managed_policy(
-            iam.ManagedPolicy.from_aws_managed_policy_name("AmazonSageMakerPipelinesIntegrations")
-        )
-        sagemaker_role.add_managed_policy(
-            iam.ManagedPolicy.from_aws_managed_policy_name("AmazonSageMakerCanvasFullAccess")
-        )
+        for policy_name in _SAGEMAKER_MANAGED_POLICIES:
+            sagemaker_role.add_managed_policy(_managed_policy(policy_name))
 
         # Create comprehensive policy for EMR Serverless integration
-        policy_statements = [
-            # EMR Serverless application access
-            iam.PolicyStatement(
-                actions=[
-                    "emr-serverless:StartApplication",
-                    "emr-serverless:StopApplication",
-                    "emr-serverless:UpdateApplication",
-                    "emr-serverless:RunJob",
-                    "emr-serverless:CancelJobRun",
-                    "emr-serverless:GetJobRun",
-                    "emr-serverless:GetApplication",
-                    "emr-serverless:AccessLivyEndpoints",
-                    "emr-serverless:GetDashboardForJobRun",
-                ],
-                effect=iam.Effect.ALLOW,
-                resources=[f"arn:aws:emr-serverless:{region}:{account}:applications/{emr_app.ref}"],
-            ),
-            # List applications
-            iam.PolicyStatement(
-                sid="EMRServerlessUnTaggedActions",
-                effect=iam.Effect.ALLOW,
-                actions=["emr-serverless:ListApplications"],
-                resources=[f"arn:aws:emr-serverless:{region}:{account}:/*"],
+        # Several statements target the same ARN; build each distinct ARN once and share the token
+        emr_arns = {
+            suffix: self.stack.format_arn(
+                service="emr-serverless",
+                resource=suffix.format(app_id=emr_app.ref),
+                arn_format=ArnFormat.NO_RESOURCE_NAME,
+            )
+            for suffix in {spec[3] for spec in _EMR_SERVERLESS_STATEMENT_SPECS}
+        }
+        # Remaining statements as (sid, effect, actions, resources, conditions) rows, same shape as the EMR specs
+        statement_rows = (
+            *(
+                (sid, effect, actions, [emr_arns[resource_suffix]], conditions)
+                for sid, effect, actions, resource_suffix, conditions in _EMR_SERVERLESS_STATEMENT_SPECS
             ),
             # Pass role to EMR Serverless
-            iam.PolicyStatement(
-                sid="EMRServerlessPassRole",
-                effect=iam.Effect.ALLOW,
-                actions=["iam:PassRole"],
-                resources=[glue_role.role_arn],
-                conditions={
-                    "StringLike": {
-                        "iam:PassedToService": "emr-serverless.amazonaws.com",
-                    }
-                },
-            ),
-            # Create and tag EMR Serverless applications
-            iam.PolicyStatement(
-                sid="EMRServerlessCreateApplicationAction",
-                effect=iam.Effect.ALLOW,
-                actions=["emr-serverless:CreateApplication", "emr-serverless:TagResource"],
-                resources=[f"arn:aws:emr-serverless:{region}:{account}:/*"],
-                conditions={
-                    "ForAllValues:StringEquals": {
-                        "aws:TagKeys": [
-                            "sagemaker:domain-arn",
-                            "sagemaker:user-profile-arn",
-                            "sagemaker:space-arn",
-                        ]
-                    },
-                    "Null": {
-                        "aws:RequestTag/sagemaker:domain-arn": "false",
-                        "aws:RequestTag/sagemaker:user-profile-arn": "false",
-                        "aws:RequestTag/sagemaker:space-arn": "false",
-                    },
-                },
-            ),
-            # Restrictive tagging policy
-            iam.PolicyStatement(
-                sid="EMRServerlessDenyPermissiveTaggingAction",
-                effect=iam.Effect.DENY,
-                actions=["emr-serverless:TagResource", "emr-serverless:UntagResource"],
-                resources=[f"arn:aws:emr-serverless:{region}:{account}:/*"],
-                conditions={
-                    "Null": {
-                        "aws:ResourceTag/sagemaker:domain-arn": "true",
-                        "aws:ResourceTag/sagemaker:user-profile-arn": "true",
-                        "aws:ResourceTag/sagemaker:space-arn": "true",
-                    },
-                },
-            ),
-            # Additional EMR Serverless actions
-            iam.PolicyStatement(
-                sid="EMRServerlessActions",
-                effect=iam.Effect.ALLOW,
-                actions=[
-                    "emr-serverless:StartApplication",
-                    "emr-serverless:StopApplication",
-                    "emr-serverless:GetApplication",
-                    "emr-serverless:DeleteApplication",
-                    "emr-serverless:AccessLivyEndpoints",
-                    "emr-serverless:GetDashboardForJobRun",
-                ],
-                resources=[f"arn:aws:emr-serverless:{region}:{account}:/applications/*"],
-                conditions={
-                    "Null": {
-                        "aws:ResourceTag/sagemaker:domain-arn": "false",
-                        "aws:ResourceTag/sagemaker:user-profile-arn": "false",
-                        "aws:ResourceTag/sagemaker:space-arn": "false",
-                    },
-                },
+            (
+                "EMRServerlessPassRole",
+                iam.Effect.ALLOW,
+                ("iam:PassRole",),
+                [glue_role.role_arn],
+                {"StringLike": {"iam:PassedToService": "emr-serverless.amazonaws.com"}},
             ),
             # ECR access for custom container images
-            iam.PolicyStatement(
-                sid="ECRRepositoryListGetPolicy",
-                effect=iam.Effect.ALLOW,
-                actions=["ecr:GetDownloadUrlForLayer", "ecr:BatchGetImage", "ecr:DescribeImages"],
-                resources=[f"arn:aws:ecr:*:{account}:*/*"],
+            (
+                "ECRRepositoryListGetPolicy",
+                iam.Effect.ALLOW,
+                _ECR_IMAGE_READ_ACTIONS,
+                [self.stack.format_arn(service="ecr", region="*", resource="*", resource_name="*")],
+                None,
             ),
             # Monitor RDS export tasks
-            iam.PolicyStatement(
-                sid="RDSMonitorExportTasks",
-                effect=iam.Effect.ALLOW,
-                actions=["rds:DescribeExportTasks"],
-                resources=[db_instance.cluster_arn],
-            ),
+            ("RDSMonitorExportTasks", iam.Effect.ALLOW, ("rds:DescribeExportTasks",), [db_instance.cluster_arn], None),
             # Describe ECS tasks for EFS export
-            iam.PolicyStatement(
-                effect=iam.Effect.ALLOW,
-                actions=["ecs:DescribeTasks"],
-                resources=["*"],
-                conditions={"ArnEquals": {"ecs:TaskArn": sync_efs_to_s3_task.task_definition_arn}},
+            (
+                None,
+                iam.Effect.ALLOW,
+                ("ecs:DescribeTasks",),
+                ["*"],
+                {"ArnEquals": {"ecs:TaskArn": sync_efs_to_s3_task.task_definition_arn}},
             ),
-            # KMS permissions
-            kms_policy_statement,
+        )
+        policy_statements = [
+            iam.PolicyStatement(
+                sid=sid, effect=effect, actions=list(actions), resources=resources, conditions=conditions
+            )
+            for sid, effect, actions, resources, conditions in statement_rows
         ]
+        # KMS permissions (shared with the task role and export Lambda via SharedKmsPolicy)
+        policy_statements.append(kms_policy_statement)
 
         # Create and attach policy
         policy = iam.Policy(
@@ -732,46 +880,85 @@ class AnalyticsComponents:
 
         # Add suppressions for EMRServerless policy
         # EMR Serverless and ECR require wildcard resources per AWS service design
-        NagSuppressions.add_resource_suppressions(
-            policy,
-            [
-                {
-                    "id": "AwsSolutions-IAM5",
-                    "reason": "Wildcard permissions for EMR Serverless applications (arn:aws:emr-serverless:*:*/applications/*), ECR images (arn:aws:ecr:*:*/*), and ECS DescribeTasks are required for SageMaker Studio data science workflows. See docs/cdk-nag-suppressions.md.",
-                },
-                {
-                    "id": "HIPAA.Security-IAMNoInlinePolicy",
-                    "reason": "Inline policy is required for EMR Serverless and data science workflow permissions - provides least-privilege access for SageMaker Studio",
-                },
-            ],
-        )
+        suppress(policy, list(_EMR_SERVERLESS_POLICY_SUPPRESSIONS))
+
+        # Create SageMaker VPC Endpoints (both share one security group)
+        if create_sagemaker_vpc_endpoints:
+            sagemaker_endpoint_security_group = ec2.SecurityGroup(
+                self.scope,
+                "SageMakerEndpointSecurityGroup",
+                vpc=vpc,
+                description="Shared security group for the SageMaker API and Runtime interface endpoints",
+                allow_all_outbound=False,
+            )
+            # One HTTPS ingress rule from the VPC covers both endpoints (they are created with open=False)
+            sagemaker_endpoint_security_group.add_ingress_rule(
+                ec2.Peer.ipv4(vpc.vpc_cidr_block),
+                ec2.Port.tcp(443),
+                "HTTPS from within the VPC to the SageMaker interface endpoints",
+            )
+            # Suppress false positives for the shared endpoint security group
+            suppress_vpc_endpoint_security_group_findings(sagemaker_endpoint_security_group, "SageMaker")
 
-        # Create SageMaker VPC Endpoints
-        self.sagemaker_api_interface_endpoint = vpc.add_interface_endpoint(
-            "sagemaker_api_interface_endpoint",
-            private_dns_enabled=True,
-            service=ec2.InterfaceVpcEndpointAwsService.SAGEMAKER_API,
-            subnets=ec2.SubnetSelection(subnet_type=ec2.SubnetType.PRIVATE_WITH_EGRESS),
+            # Resolve the private subnets once and hand the same selection to both endpoints
+            endpoint_subnets = ec2.SubnetSelection(
+                subnets=vpc.select_subnets(subnet_type=ec2.SubnetType.PRIVATE_WITH_EGRESS).subnets
+            )
+
+            self.sagemaker_api_interface_endpoint = self._add_sagemaker_interface_endpoint(
+                vpc,
+                "sagemaker_api_interface_endpoint",
+                ec2.InterfaceVpcEndpointAwsService.SAGEMAKER_API,
+                sagemaker_endpoint_security_group,
+                endpoint_subnets,
+            )
+            self.sagemaker_runtime_interface_endpoint = self._add_sagemaker_interface_endpoint(
+                vpc,
+                "sagemaker_runtime_interface_endpoint",
+                ec2.InterfaceVpcEndpointAwsService.SAGEMAKER_RUNTIME,
+                sagemaker_endpoint_security_group,
+                endpoint_subnets,
+            )
+
+        for construct, suppressions, apply_to_children in pending_suppressions:
+            add_resource_suppressions(construct, suppressions, apply_to_children=apply_to_children)
+
+        return AnalyticsOutputs(
+            analytics_kms_key=self.analytics_kms_key,
+            export_bucket_rds=self.export_bucket_rds,
+            export_bucket_efs=self.export_bucket_efs,
+            sagemaker_domain=sagemaker_domain,
+            sagemaker_user=sagemaker_user,
+            emr_app=emr_app,
         )
-        # Suppress false positives for SageMaker API endpoint security group
-        for sg in self.sagemaker_api_interface_endpoint.connections.security_groups:
-            suppress_vpc_endpoint_security_group_findings(sg, "SageMaker API")
 
-        self.sagemaker_runtime_interface_endpoint = vpc.add_interface_endpoint(
-            "sagemaker_runtime_interface_endpoint",
+    def _add_sagemaker_interface_endpoint(
+        self,
+        vpc: ec2.Vpc,
+        endpoint_id: str,
+        service: ec2.InterfaceVpcEndpointAwsService,
+        security_group: ec2.SecurityGroup,
+        subnets: ec2.SubnetSelection,
+    ) -> ec2.InterfaceVpcEndpoint:
+        """Add a private-DNS SageMaker interface endpoint.
+
+        The endpoint is not opened to the VPC itself; access comes from the shared security group's ingress rule.
+
+        Args:
+            vpc: The VPC to add the endpoint to
+            endpoint_id: Construct ID for the endpoint
+            service: The SageMaker endpoint service
+            security_group: Security group shared by the SageMaker endpoints
+            subnets: Pre-resolved private subnet selection
+
+        Returns:
+            The created interface endpoint
+        """
+        return vpc.add_interface_endpoint(
+            endpoint_id,
             private_dns_enabled=True,
-            service=ec2.InterfaceVpcEndpointAwsService.SAGEMAKER_RUNTIME,
-            subnets=ec2.SubnetSelection(subnet_type=ec2.SubnetType.PRIVATE_WITH_EGRESS),
-        )
-        # Suppress false positives for SageMaker Runtime endpoint security group
-        for sg in self.sagemaker_runtime_interface_endpoint.connections.security_groups:
-            suppress_vpc_endpoint_security_group_findings(sg, "SageMaker Runtime")
-
-        return {
-            "analytics_kms_key": self.analytics_kms_key,
-            "export_bucket_rds": self.export_bucket_rds,
-            "export_bucket_efs": self.export_bucket_efs,
-            "sagemaker_domain": sagemaker_domain,
-            "sagemaker_user": sagemaker_user,
-            "emr_app": emr_app,
-        }
+            service=service,
+            subnets=subnets,
+            security_groups=[security_group],
+            open=False,
+        )
@@ -17,11 +17,11 @@ from aws_cdk import aws_kms as kms
 from aws_cdk import aws_logs as logs
 from aws_cdk import aws_s3 as s3
 from aws_cdk import aws_secretsmanager as secretsmanager
-from cdk_nag import NagSuppressions
 from constructs import Construct
 
 from .constants import StackConstants
-from .utils import get_resource_suffix, is_true
+from .nag_suppressions import add_resource_suppressions
+from .utils import default_policy_resource, get_resource_suffix, is_true
 
 
 class ComputeComponents:
@@ -94,7 +94,7 @@ class ComputeComponents:
             )
 
             # Add suppressions for ECS Exec bucket (temporary command output storage)
-            NagSuppressions.add_resource_suppressions(
+            add_resource_suppressions(
                 self.exec_bucket,
                 [
                     {
@@ -759,8 +759,8 @@ class ComputeComponents:
         )
 
         # Suppress inline policy warnings for execution and task roles (after container creates DefaultPolicies)
-        NagSuppressions.add_resource_suppressions(
-            openemr_fargate_task_definition.execution_role.node.find_child("DefaultPolicy").node.find_child("Resource"),
+        add_resource_suppressions(
+            default_policy_resource(openemr_fargate_task_definition.execution_role),
             [
                 {
                     "id": "HIPAA.Security-IAMNoInlinePolicy",
@@ -771,7 +771,7 @@ class ComputeComponents:
 
         # Suppress ECS task definition environment variable warning
         # Environment variables contain non-sensitive configuration only
-        NagSuppressions.add_resource_suppressions(
+        add_resource_suppressions(
             openemr_fargate_task_definition,
             [
                 {
@@ -897,8 +897,8 @@ class ComputeComponents:
             )
 
             # Suppress inline policy warnings for task role (after grants create DefaultPolicy)
-            NagSuppressions.add_resource_suppressions(
-                openemr_fargate_task_definition.task_role.node.find_child("DefaultPolicy").node.find_child("Resource"),
+            add_resource_suppressions(
+                default_policy_resource(openemr_fargate_task_definition.task_role),
                 [
                     {
                         "id": "AwsSolutions-IAM5",
@@ -1019,7 +1019,7 @@ class ComputeComponents:
         self.scope.kms_keys.central_key.grant_encrypt_decrypt(rotation_task_definition.task_role)
 
         # Apply suppressions for least-privilege ECS task execution policies.
-        NagSuppressions.add_resource_suppressions(
+        add_resource_suppressions(
             rotation_task_definition.task_role,
             [
                 {
@@ -1038,7 +1038,7 @@ class ComputeComponents:
             ],
             apply_to_children=True,
         )
-        NagSuppressions.add_resource_suppressions(
+        add_resource_suppressions(
             rotation_task_definition,
             [
                 {
@@ -1047,7 +1047,7 @@ class ComputeComponents:
                 }
             ],
         )
-        NagSuppressions.add_resource_suppressions(
+        add_resource_suppressions(
             rotation_task_definition.execution_role,
             [
                 {
@@ -12,10 +12,9 @@ from aws_cdk import aws_iam as iam
 from aws_cdk import aws_rds as rds
 from aws_cdk import aws_secretsmanager as secretsmanager
 from aws_cdk import aws_ssm as ssm
-from cdk_nag import NagSuppressions
 from constructs import Construct
 
-from .nag_suppressions import suppress_vpc_endpoint_security_group_findings
+from .nag_suppressions import add_resource_suppressions, suppress_vpc_endpoint_security_group_findings
 from .utils import get_resource_suffix, is_true
 
 
@@ -84,7 +83,7 @@ class DatabaseComponents:
         )
 
         # Suppress rotation warnings - Aurora manages credentials automatically
-        NagSuppressions.add_resource_suppressions(
+        add_resource_suppressions(
             self.db_secret,
             [
                 {
@@ -145,7 +144,7 @@ class DatabaseComponents:
                 parameters["aurora_ml_inference_timeout"] = str(context.get("aurora_ml_inference_timeout"))
 
             # Suppress wildcard resource warnings for Bedrock foundation models
-            NagSuppressions.add_resource_suppressions(
+            add_resource_suppressions(
                 database_ml_role,
                 [
                     {
@@ -250,7 +249,7 @@ class DatabaseComponents:
             )
 
         # Add RDS suppressions for intentional configurations
-        NagSuppressions.add_resource_suppressions(
+        add_resource_suppressions(
             self.db_instance,
             [
                 {
@@ -310,7 +309,7 @@ class DatabaseComponents:
             suppress_vpc_endpoint_security_group_findings(bedrock_sg, "Bedrock Runtime")
 
             # Suppress CDK Nag validation failures for intrinsic function (database port)
-            NagSuppressions.add_resource_suppressions(
+            add_resource_suppressions(
                 bedrock_sg,
                 [
                     {
@@ -456,7 +455,7 @@ class DatabaseComponents:
             ),
         )
 
-        NagSuppressions.add_resource_suppressions(
+        add_resource_suppressions(
             self.rds_slot_secret,
             [
                 {
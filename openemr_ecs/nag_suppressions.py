@@ -1,7 +1,27 @@
 """Helper functions for CDK Nag suppressions."""
 
-from cdk_nag import NagSuppressions
-from constructs import Construct
+import os
+
+from constructs import IConstruct
+
+# Set CDK_NAG_DISABLE=1 to synthesise without cdk-nag checks; suppressions are then skipped as well.
+NAG_ENABLED = os.environ.get("CDK_NAG_DISABLE") != "1"
+
+
+def add_resource_suppressions(construct: IConstruct, suppressions: list, apply_to_children: bool = False) -> None:
+    """Add CDK Nag suppressions to a construct, or do nothing when cdk-nag is disabled.
+
+    Args:
+        construct: The construct to suppress findings for
+        suppressions: List of suppression dicts ("id", "reason", optional "appliesTo")
+        apply_to_children: Also apply the suppressions to all child constructs
+    """
+    if not NAG_ENABLED:
+        return
+    # Imported here so cdk_nag is never loaded when checks are disabled
+    from cdk_nag import NagSuppressions
+
+    NagSuppressions.add_resource_suppressions(construct, suppressions, apply_to_children=apply_to_children)
 
 
 def suppress_lambda_common_findings(lambda_function, vpc_required=False, reason_suffix=""):
@@ -39,7 +59,7 @@ def suppress_lambda_common_findings(lambda_function, vpc_required=False, reason_
             }
         )
 
-    NagSuppressions.add_resource_suppressions(
+    add_resource_suppressions(
         lambda_function,
         suppressions,
     )
@@ -119,7 +139,7 @@ def suppress_lambda_role_common_findings(lambda_role, role_type="basic"):
             }
         )
 
-    NagSuppressions.add_resource_suppressions(
+    add_resource_suppressions(
         lambda_role,
         suppressions,
         apply_to_children=True,
@@ -189,21 +209,27 @@ def suppress_sagemaker_role_findings(sagemaker_role):
         ]
     )
 
-    NagSuppressions.add_resource_suppressions(
+    add_resource_suppressions(
         sagemaker_role,
         suppressions,
         apply_to_children=True,
     )
 
 
-def suppress_vpc_endpoint_security_group_findings(security_group: Construct, endpoint_name: str):
+def suppress_vpc_endpoint_security_group_findings(construct: IConstruct, endpoint_name: str):
     """Applies common NagSuppressions to VPC endpoint security groups.
 
     These suppressions address false positives from cdk_nag when intrinsic
     functions are used in security group rules (e.g., vpc.cidr_block, database port).
+    Pass the security group itself (e.g. from endpoint.connections.security_groups),
+    not the endpoint, so the endpoint resource is not covered by these suppressions.
+
+    Args:
+        construct: The VPC endpoint security group
+        endpoint_name: Endpoint name used in the suppression reasons
     """
-    NagSuppressions.add_resource_suppressions(
-        security_group,
+    add_resource_suppressions(
+        construct,
         [
             {
                 "id": "CdkNagValidationFailure",
@@ -13,9 +13,9 @@ from aws_cdk import aws_globalaccelerator as ga
 from aws_cdk import aws_globalaccelerator_endpoints as ga_endpoints
 from aws_cdk import aws_iam as iam
 from aws_cdk import aws_logs as logs
-from cdk_nag import NagSuppressions
 from constructs import Construct
 
+from .nag_suppressions import add_resource_suppressions
 from .utils import is_true
 
 
@@ -94,7 +94,7 @@ class NetworkComponents:
         # The default SG is created automatically and must be explicitly restricted
         # We document that it's closed via suppression (cannot be deleted, AWS limitation)
         # For cdk-nag compliance, we add a suppression noting that we close it via other means
-        NagSuppressions.add_resource_suppressions(
+        add_resource_suppressions(
             self.vpc,
             [
                 {
@@ -106,7 +106,7 @@ class NetworkComponents:
 
         # Suppress IGW route warnings - these are required for ALB internet connectivity
         for subnet in self.vpc.public_subnets:
-            NagSuppressions.add_resource_suppressions(
+            add_resource_suppressions(
                 subnet,
                 [
                     {
@@ -135,7 +135,7 @@ class NetworkComponents:
         )
 
         # Suppress false positives for database port (resolved via intrinsic function)
-        NagSuppressions.add_resource_suppressions(
+        add_resource_suppressions(
             self.db_sec_group,
             [
                 {
@@ -162,7 +162,7 @@ class NetworkComponents:
 
         # Suppress AwsSolutions-EC23 for ALB - it's intentionally public-facing for web traffic
         # The security group rules are properly scoped below based on user-provided CIDR blocks
-        NagSuppressions.add_resource_suppressions(
+        add_resource_suppressions(
             self.lb_sec_group,
             [
                 {
@@ -28,15 +28,15 @@ from aws_cdk import aws_wafv2 as wafv2
 from aws_cdk import (
     triggers,
 )
-from cdk_nag import NagSuppressions
 from constructs import Construct
 
 from .nag_suppressions import (
+    add_resource_suppressions,
     suppress_lambda_common_findings,
     suppress_lambda_role_common_findings,
     suppress_vpc_endpoint_security_group_findings,
 )
-from .utils import is_true
+from .utils import LAMBDA_FUNCTIONS_ASSET_EXCLUDE, default_policy_resource, is_true
 
 
 class SecurityComponents:
@@ -210,7 +210,7 @@ class SecurityComponents:
         )
 
         # Add NagSuppression for WAF Log Group
-        NagSuppressions.add_resource_suppressions(
+        add_resource_suppressions(
             waf_log_group,
             [
                 {
@@ -359,7 +359,7 @@ class SecurityComponents:
         ses_domain_identity.grant_send_email(ses_smtp_user)
 
         # Suppress IAM user group membership requirement - this is a service account for SMTP
-        NagSuppressions.add_resource_suppressions(
+        add_resource_suppressions(
             ses_smtp_user,
             [
                 {
@@ -376,7 +376,7 @@ class SecurityComponents:
 
         # Suppress inline policy for SMTP user's DefaultPolicy (CDK-generated)
         # Note: This suppression must be added after grant_send_email() creates the policy
-        NagSuppressions.add_resource_suppressions(
+        add_resource_suppressions(
             ses_smtp_user,
             [
                 {
@@ -408,7 +408,7 @@ class SecurityComponents:
 
         # Suppress rotation warnings for SMTP credentials (IAM user based, not auto-rotatable)
         for secret in [self.smtp_password, secret_access_key]:
-            NagSuppressions.add_resource_suppressions(
+            add_resource_suppressions(
                 secret,
                 [
                     {
@@ -427,7 +427,7 @@ class SecurityComponents:
             self.scope,
             "SMTPSetup",
             runtime=lambda_python_runtime,
-            code=_lambda.Code.from_asset("lambda"),
+            code=_lambda.Code.from_asset("lambda", exclude=LAMBDA_FUNCTIONS_ASSET_EXCLUDE),
             architecture=_lambda.Architecture.ARM_64,
             handler="lambda_functions.generate_smtp_credential",
             timeout=Duration.minutes(10),
@@ -446,10 +446,8 @@ class SecurityComponents:
         self.smtp_password.grant_write(self.one_time_generate_smtp_credential_lambda.role)  # type: ignore
 
         # Add suppressions for DefaultPolicy (after grants create it)
-        NagSuppressions.add_resource_suppressions(
-            self.one_time_generate_smtp_credential_lambda.role.node.find_child("DefaultPolicy").node.find_child(
-                "Resource"
-            ),
+        add_resource_suppressions(
+            default_policy_resource(self.one_time_generate_smtp_credential_lambda.role),
             [
                 {
                     "id": "AwsSolutions-IAM5",
@@ -506,8 +504,8 @@ class SecurityComponents:
             subnets=ec2.SubnetSelection(subnet_type=ec2.SubnetType.PRIVATE_WITH_EGRESS),
         )
         # Suppress false positives for SMTP endpoint security group
-        for sg in self.smtp_interface_endpoint.connections.security_groups:
-            suppress_vpc_endpoint_security_group_findings(sg, "SMTP")
+        for security_group in self.smtp_interface_endpoint.connections.security_groups:
+            suppress_vpc_endpoint_security_group_findings(security_group, "SMTP")
 
         # Validate Email Receiving Domain
         route53.MxRecord(
@@ -533,7 +531,7 @@ class SecurityComponents:
         )
 
         # Add NagSuppressions for EmailStorageBucket
-        NagSuppressions.add_resource_suppressions(
+        add_resource_suppressions(
             self.email_storage_bucket,
             [
                 {
@@ -583,7 +581,7 @@ class SecurityComponents:
                 self.scope,
                 "EmailForwardingLambda",
                 runtime=lambda_python_runtime,
-                code=_lambda.Code.from_asset("lambda"),
+                code=_lambda.Code.from_asset("lambda", exclude=LAMBDA_FUNCTIONS_ASSET_EXCLUDE),
                 architecture=_lambda.Architecture.ARM_64,
                 handler="lambda_functions.send_email",
                 environment={
@@ -605,8 +603,8 @@ class SecurityComponents:
             ses_domain_identity.grant_send_email(email_forwarding_lambda)
 
             # Suppress wildcard S3 permissions and inline policy (after grants create DefaultPolicy)
-            NagSuppressions.add_resource_suppressions(
-                email_forwarding_lambda.role.node.find_child("DefaultPolicy").node.find_child("Resource"),  # type: ignore
+            add_resource_suppressions(
+                default_policy_resource(email_forwarding_lambda.role),  # type: ignore
                 [
                     {
                         "id": "AwsSolutions-IAM5",
@@ -658,7 +656,7 @@ class SecurityComponents:
             self.scope,
             "MakeRuleSetActive",
             runtime=lambda_python_runtime,
-            code=_lambda.Code.from_asset("lambda"),
+            code=_lambda.Code.from_asset("lambda", exclude=LAMBDA_FUNCTIONS_ASSET_EXCLUDE),
             architecture=_lambda.Architecture.ARM_64,
             handler="lambda_functions.make_ruleset_active",
             timeout=Duration.minutes(10),
@@ -677,7 +675,7 @@ class SecurityComponents:
         suppress_lambda_role_common_findings(set_rule_set_to_active.role, role_type="ses_activation")  # type: ignore
 
         # Suppress wildcard resource for SES (required by AWS service)
-        NagSuppressions.add_resource_suppressions(
+        add_resource_suppressions(
             set_rule_set_to_active.role,  # type: ignore
             [
                 {
@@ -765,7 +763,7 @@ class SecurityComponents:
         )
 
         # Suppress inline policy for execution role (after container creates the DefaultPolicy)
-        NagSuppressions.add_resource_suppressions(
+        add_resource_suppressions(
             create_ssl_materials_task.execution_role,
             [
                 {
@@ -798,7 +796,7 @@ class SecurityComponents:
             self.scope,
             "MaintainSSLMaterialsLambda",
             runtime=lambda_python_runtime,
-            code=_lambda.Code.from_asset("lambda"),
+            code=_lambda.Code.from_asset("lambda", exclude=LAMBDA_FUNCTIONS_ASSET_EXCLUDE),
             architecture=_lambda.Architecture.ARM_64,
             handler="lambda_functions.generate_ssl_materials",
             timeout=Duration.minutes(10),
@@ -823,7 +821,7 @@ class SecurityComponents:
         suppress_lambda_role_common_findings(create_ssl_materials_lambda.role, role_type="ecs_task")  # type: ignore
 
         # Suppress wildcard ECS permissions (required for RunTask)
-        NagSuppressions.add_resource_suppressions(
+        add_resource_suppressions(
             create_ssl_materials_lambda.role,  # type: ignore
             [
                 {
@@ -854,7 +852,7 @@ class SecurityComponents:
             self.scope,
             "OneTimeSSLSetup",
             runtime=lambda_python_runtime,
-            code=_lambda.Code.from_asset("lambda"),
+            code=_lambda.Code.from_asset("lambda", exclude=LAMBDA_FUNCTIONS_ASSET_EXCLUDE),
             architecture=_lambda.Architecture.ARM_64,
             handler="lambda_functions.generate_ssl_materials",
             timeout=Duration.minutes(10),
@@ -873,7 +871,7 @@ class SecurityComponents:
         suppress_lambda_role_common_findings(self.one_time_create_ssl_materials_lambda.role, role_type="ecs_task")  # type: ignore
 
         # Suppress wildcard ECS permissions (required for RunTask)
-        NagSuppressions.add_resource_suppressions(
+        add_resource_suppressions(
             self.one_time_create_ssl_materials_lambda.role,  # type: ignore
             [
                 {
@@ -15,7 +15,6 @@ from aws_cdk import aws_iam as iam
 from aws_cdk import aws_lambda as _lambda
 from aws_cdk import aws_secretsmanager as secretsmanager
 from aws_cdk import aws_ssm as ssm
-from cdk_nag import NagSuppressions
 from constructs import Construct
 
 from .analytics import AnalyticsComponents
@@ -27,6 +26,7 @@ from .constants import StackConstants
 from .database import DatabaseComponents
 from .kms_keys import KmsKeys
 from .monitoring import MonitoringComponents
+from .nag_suppressions import add_resource_suppressions
 from .network import NetworkComponents
 from .security import SecurityComponents
 from .storage import StorageComponents
@@ -70,6 +70,7 @@ class OpenemrEcsStack(Stack):
             "enable_global_accelerator",
             "configure_ses",
             "create_serverless_analytics_environment",
+            "enable_sagemaker_vpc_endpoints",
             "aurora_ml_inference_timeout",
             "net_read_timeout",
             "net_write_timeout",
@@ -467,29 +468,32 @@ class OpenemrEcsStack(Stack):
         )
 
         # Create serverless analytics environment (optional)
+        # SageMaker interface endpoints default to on; set enable_sagemaker_vpc_endpoints to "false" to skip them
+        sagemaker_vpc_endpoints = context.get("enable_sagemaker_vpc_endpoints")
+        analytics_result = analytics.create_serverless_analytics_environment(
+            self.vpc,
+            self.db_instance,
+            self.ecs_cluster,
+            self.log_group,
+            self.file_system_for_sites_folder,
+            self.efs_volume_configuration_for_sites_folder,
+            self.efs_only_security_group,  # type: ignore
+            self.openemr_version,
+            self.container_port,
+            self.emr_serverless_release_label,
+            self.lambda_python_runtime,
+            self.account,
+            self.region,
+            self.node.addr,
+            enabled=is_true(context.get("create_serverless_analytics_environment")),
+            create_sagemaker_vpc_endpoints=sagemaker_vpc_endpoints is None or is_true(sagemaker_vpc_endpoints),
+        )
+        self.sagemaker_api_interface_endpoint = analytics.sagemaker_api_interface_endpoint
+        self.sagemaker_runtime_interface_endpoint = analytics.sagemaker_runtime_interface_endpoint
+        # Store the SageMaker domain ID for cleanup
         self.sagemaker_domain_id = None
-        if is_true(context.get("create_serverless_analytics_environment")):
-            analytics_result = analytics.create_serverless_analytics_environment(
-                self.vpc,
-                self.db_instance,
-                self.ecs_cluster,
-                self.log_group,
-                self.file_system_for_sites_folder,
-                self.efs_volume_configuration_for_sites_folder,
-                self.efs_only_security_group,  # type: ignore
-                self.openemr_version,
-                self.container_port,
-                self.emr_serverless_release_label,
-                self.lambda_python_runtime,
-                self.account,
-                self.region,
-                self.node.addr,
-            )
-            self.sagemaker_api_interface_endpoint = analytics.sagemaker_api_interface_endpoint
-            self.sagemaker_runtime_interface_endpoint = analytics.sagemaker_runtime_interface_endpoint
-            # Store the SageMaker domain ID for cleanup
-            if analytics_result and "sagemaker_domain" in analytics_result:
-                self.sagemaker_domain_id = analytics_result["sagemaker_domain"].attr_domain_id
+        if analytics_result is not None:
+            self.sagemaker_domain_id = analytics_result.sagemaker_domain.attr_domain_id
 
         # Create monitoring and alarms if enabled
         monitoring_alarms_topic = None
@@ -610,7 +614,7 @@ def handler(event, context):
             reason_suffix="One-shot Lambda that sets stack termination protection.",
         )
         suppress_lambda_role_common_findings(enable_protection_lambda.role)
-        NagSuppressions.add_resource_suppressions(
+        add_resource_suppressions(
             enable_protection_lambda.role,
             [
                 {
@@ -662,7 +666,7 @@ def handler(event, context):
         )
 
         # Suppress rotation warnings for admin password (manually rotated by administrators)
-        NagSuppressions.add_resource_suppressions(
+        add_resource_suppressions(
             self.password,
             [
                 {
@@ -2,6 +2,14 @@
 
 from typing import Optional
 
+from constructs import IConstruct
+
+# lambda/ holds two independent asset bundles: the handlers in lambda_functions.py and the stack cleanup
+# handler in stack_cleanup.py. Each excludes the other so that editing one leaves the other's asset hash
+# unchanged; a new hash would publish new function versions and re-run one-time triggers such as OneTimeSSLSetup.
+LAMBDA_FUNCTIONS_ASSET_EXCLUDE = ["stack_cleanup.py"]
+STACK_CLEANUP_ASSET_EXCLUDE = ["*", "!stack_cleanup.py"]
+
 
 def is_true(val: Optional[str]) -> bool:
     """Check if a context value represents a true boolean.
@@ -31,3 +39,18 @@ def get_resource_suffix(context: dict) -> str:
     """
     result = context.get("openemr_resource_suffix", "default")
     return str(result) if result is not None else "default"
+
+
+def default_policy_resource(principal: IConstruct) -> IConstruct:
+    """Return the CfnPolicy behind a role's CDK-generated DefaultPolicy.
+
+    The DefaultPolicy only exists once a grant or add_to_policy call has been made,
+    so call this after all grants for the role are in place.
+
+    Args:
+        principal: The role (or other construct) owning the DefaultPolicy
+
+    Returns:
+        The underlying AWS::IAM::Policy resource, for attaching NagSuppressions
+    """
+    return principal.node.find_child("DefaultPolicy").node.find_child("Resource")
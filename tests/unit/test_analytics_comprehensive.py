@@ -205,6 +205,69 @@ class TestAnalyticsModule:
         assert AnalyticsComponents is not None
         assert callable(AnalyticsComponents)
 
+    def test_analytics_outputs_is_frozen(self):
+        """Test AnalyticsOutputs is an immutable, slotted dataclass."""
+        import dataclasses
+
+        from openemr_ecs.analytics import AnalyticsOutputs
+
+        outputs = AnalyticsOutputs(*(object() for _ in dataclasses.fields(AnalyticsOutputs)))
+
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            outputs.emr_app = None
+        assert not hasattr(outputs, "__dict__")
+
+    def test_emr_serverless_statement_sids_are_alphanumeric(self):
+        """Test the static EMR Serverless statement SIDs are valid IAM identity-policy SIDs."""
+        import re
+
+        from openemr_ecs.analytics import _EMR_SERVERLESS_STATEMENT_SPECS
+
+        for sid, *_ in _EMR_SERVERLESS_STATEMENT_SPECS:
+            assert sid is None or re.fullmatch(r"[0-9A-Za-z]+", sid), f"Invalid IAM statement SID {sid!r}"
+
+    def test_unique_id_depends_on_node_address(self):
+        """Test unique_id is stable per node address and distinct across addresses."""
+        from openemr_ecs.analytics import AnalyticsComponents
+
+        components = AnalyticsComponents(None)
+
+        first = components.unique_id("c8aaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaa")
+        second = components.unique_id("c8bbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbb")
+
+        assert len(first) == 18
+        assert first == components.unique_id("c8aaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaa")
+        assert first != second
+
+
+class TestAnalyticsNagSuppressions:
+    """Test cdk-nag suppressions on analytics resources."""
+
+    def test_emr_serverless_policy_has_no_iam5_errors(self):
+        """Test the EMR Serverless policy wildcard suppressions match the ARNs cdk-nag renders."""
+        from aws_cdk import Aspects
+        from cdk_nag import AwsSolutionsChecks
+
+        app = App()
+        app.node.set_context("route53_domain", "example.com")
+        app.node.set_context("enable_sagemaker", "true")
+        app.node.set_context("create_serverless_analytics_environment", "true")
+        Aspects.of(app).add(AwsSolutionsChecks())
+
+        from openemr_ecs.stack import OpenemrEcsStack
+
+        stack = OpenemrEcsStack(
+            app,
+            "TestStack",
+            env=Environment(account="123456789012", region="us-west-2"),
+        )
+        errors = assertions.Annotations.from_stack(stack).find_error(
+            "*", assertions.Match.string_like_regexp("AwsSolutions-IAM5")
+        )
+
+        # The partition stays a token (<AWS::Partition>) even with an explicit env
+        assert [error.id for error in errors if "EMRServerlessPolicy" in error.id] == []
+
 
 class TestVPCEndpointsForAnalytics:
     """Test VPC endpoints for SageMaker."""
@@ -231,6 +294,86 @@ class TestVPCEndpointsForAnalytics:
         # Should have at least one VPC endpoint
         assert len(endpoints) >= 1
 
+    def test_sagemaker_vpc_endpoints_share_security_group(self):
+        """Test the SageMaker API and Runtime endpoints use one shared security group."""
+        app = App()
+        app.node.set_context("route53_domain", "example.com")
+        app.node.set_context("create_serverless_analytics_environment", "true")
+
+        from openemr_ecs.stack import OpenemrEcsStack
+
+        stack = OpenemrEcsStack(
+            app,
+            "TestStack",
+            env=Environment(account="123456789012", region="us-west-2"),
+        )
+        template = assertions.Template.from_stack(stack)
+
+        endpoints = template.find_resources("AWS::EC2::VPCEndpoint")
+        sagemaker_sg_refs = [
+            str(props["Properties"]["SecurityGroupIds"])
+            for props in endpoints.values()
+            if "sagemaker" in str(props["Properties"].get("ServiceName", ""))
+        ]
+
+        assert len(sagemaker_sg_refs) == 2
+        assert sagemaker_sg_refs[0] == sagemaker_sg_refs[1]
+
+    def test_sagemaker_endpoint_security_group_rules(self):
+        """Test the shared SageMaker endpoint security group only allows HTTPS in and nothing out."""
+        app = App()
+        app.node.set_context("route53_domain", "example.com")
+        app.node.set_context("create_serverless_analytics_environment", "true")
+
+        from openemr_ecs.stack import OpenemrEcsStack
+
+        stack = OpenemrEcsStack(
+            app,
+            "TestStack",
+            env=Environment(account="123456789012", region="us-west-2"),
+        )
+        template = assertions.Template.from_stack(stack)
+
+        security_groups = template.find_resources(
+            "AWS::EC2::SecurityGroup",
+            {
+                "Properties": {
+                    "GroupDescription": "Shared security group for the SageMaker API and Runtime interface endpoints"
+                }
+            },
+        )
+        assert len(security_groups) == 1
+        props = next(iter(security_groups.values()))["Properties"]
+
+        ingress = props["SecurityGroupIngress"]
+        assert len(ingress) == 1
+        assert ingress[0]["IpProtocol"] == "tcp"
+        assert ingress[0]["FromPort"] == 443
+        assert ingress[0]["ToPort"] == 443
+        # allow_all_outbound=False leaves only CDK's placeholder "disallow all traffic" egress rule
+        assert all(rule["CidrIp"] == "255.255.255.255/32" for rule in props["SecurityGroupEgress"])
+
+    def test_sagemaker_vpc_endpoints_skipped_when_disabled(self):
+        """Test the SageMaker endpoints are not created when enable_sagemaker_vpc_endpoints is false."""
+        app = App()
+        app.node.set_context("route53_domain", "example.com")
+        app.node.set_context("create_serverless_analytics_environment", "true")
+        app.node.set_context("enable_sagemaker_vpc_endpoints", "false")
+
+        from openemr_ecs.stack import OpenemrEcsStack
+
+        stack = OpenemrEcsStack(
+            app,
+            "TestStack",
+            env=Environment(account="123456789012", region="us-west-2"),
+        )
+        template = assertions.Template.from_stack(stack)
+
+        endpoints = template.find_resources("AWS::EC2::VPCEndpoint")
+        assert not any("sagemaker" in str(props["Properties"].get("ServiceName", "")) for props in endpoints.values())
+        # SageMaker Studio itself is still created
+        template.resource_count_is("AWS::SageMaker::Domain", 1)
+
 
 class TestAnalyticsKMSKeys:
     """Test KMS encryption for analytics resources."""
@@ -7,55 +7,58 @@ timeout, and the custom resource that triggers cleanup during stack deletion.
 from tests.conftest import *  # noqa: F401,F403
 
 
-class TestCleanupLambda:
-    def _find_cleanup_lambda(self, template):
-        """Find the cleanup Lambda function in the template."""
-        functions = template.find_resources("AWS::Lambda::Function")
-        for lid, fn in functions.items():
-            code = fn.get("Properties", {}).get("Code", {})
-            inline = code.get("ZipFile", "")
-            if "Cleanup handler" in inline or "cleanup" in lid.lower() or "StackCleanup" in lid:
-                return lid, fn
-        return None, None
+def _find_cleanup_lambda(template):
+    """Find the cleanup Lambda function in the template."""
+    functions = template.find_resources("AWS::Lambda::Function")
+    for lid, fn in functions.items():
+        if "cleanup" in lid.lower() or "StackCleanup" in lid:
+            return lid, fn
+    return None, None
+
 
+class TestCleanupLambda:
     def test_cleanup_lambda_exists(self, template):
-        lid, fn = self._find_cleanup_lambda(template)
+        lid, fn = _find_cleanup_lambda(template)
         assert lid is not None, "Cleanup Lambda should exist in the template"
 
     def test_cleanup_lambda_timeout(self, template):
         """Cleanup Lambda needs extended timeout for backup deletion."""
-        lid, fn = self._find_cleanup_lambda(template)
+        lid, fn = _find_cleanup_lambda(template)
         assert fn is not None
         timeout = fn["Properties"].get("Timeout", 3)
         assert timeout >= 600, "Cleanup Lambda should have at least 10 minute timeout"
 
     def test_cleanup_lambda_handler(self, template):
-        lid, fn = self._find_cleanup_lambda(template)
+        lid, fn = _find_cleanup_lambda(template)
         assert fn is not None
-        assert fn["Properties"]["Handler"] == "index.handler"
+        assert fn["Properties"]["Handler"] == "stack_cleanup.handler"
 
-    def test_cleanup_lambda_inline_code_contains_key_operations(self, template):
-        """The inline Lambda code must handle RDS, SES, backup, and SageMaker cleanup."""
-        lid, fn = self._find_cleanup_lambda(template)
+    def test_cleanup_lambda_uses_asset_code(self, template):
+        """Handler source ships as an asset (lambda/stack_cleanup.py), not inline in the template."""
+        lid, fn = _find_cleanup_lambda(template)
         assert fn is not None
-        code = fn["Properties"]["Code"]["ZipFile"]
-        assert "rds" in code.lower() or "ModifyDBCluster" in code or "rds_client" in code
-        assert "ses" in code.lower() or "set_active_receipt_rule_set" in code
-        assert "backup" in code.lower() or "delete_recovery_point" in code
-        assert "sagemaker" in code.lower() or "describe_domain" in code
-
-    def test_cleanup_lambda_sends_cfn_response(self, template):
-        """Inline code must call send_response for CloudFormation."""
-        lid, fn = self._find_cleanup_lambda(template)
-        assert fn is not None
-        code = fn["Properties"]["Code"]["ZipFile"]
-        assert "send_response" in code
+        code = fn["Properties"]["Code"]
+        assert "ZipFile" not in code
+        assert "S3Bucket" in code and "S3Key" in code
 
-    def test_cleanup_lambda_handles_delete_request_type(self, template):
-        lid, fn = self._find_cleanup_lambda(template)
+    def test_cleanup_lambda_asset_is_separate_from_shared_handlers(self, template):
+        """stack_cleanup.py ships in its own asset, so editing it cannot change the other Lambdas' code hash."""
+        lid, fn = _find_cleanup_lambda(template)
+        assert fn is not None
+        cleanup_key = fn["Properties"]["Code"]["S3Key"]
+        other_keys = {
+            other["Properties"]["Code"].get("S3Key")
+            for other_lid, other in template.find_resources("AWS::Lambda::Function").items()
+            if other_lid != lid and other["Properties"].get("Handler", "").startswith("lambda_functions.")
+        }
+        assert other_keys, "Shared lambda_functions handlers should exist in the template"
+        assert cleanup_key not in other_keys
+
+    def test_cleanup_lambda_memory_and_architecture(self, template):
+        lid, fn = _find_cleanup_lambda(template)
         assert fn is not None
-        code = fn["Properties"]["Code"]["ZipFile"]
-        assert "request_type == 'Delete'" in code or "RequestType" in code
+        assert fn["Properties"]["MemorySize"] == 1024
+        assert fn["Properties"]["Architectures"] == ["arm64"]
 
 
 class TestCleanupIAMPermissions:
@@ -125,3 +128,14 @@ class TestCleanupCustomResource:
             if "StackName" in props:
                 found = True
         assert found, "Custom resource should pass StackName property"
+
+    def test_custom_resource_service_timeout_exceeds_lambda_timeout(self, template):
+        """CloudFormation should stop waiting shortly after the cleanup Lambda times out, not after an hour."""
+        custom_resources = template.find_resources("AWS::CloudFormation::CustomResource")
+        cleanup = [cr for cr in custom_resources.values() if "StackName" in cr.get("Properties", {})]
+        assert cleanup, "Cleanup custom resource should exist"
+        assert str(cleanup[0]["Properties"]["ServiceTimeout"]) == "900"
+
+        _lid, fn = _find_cleanup_lambda(template)
+        assert fn is not None
+        assert fn["Properties"]["Timeout"] < 900, "Lambda must time out before CloudFormation stops waiting"
@@ -0,0 +1,294 @@
+"""Unit tests for the stack cleanup custom resource handler in lambda/stack_cleanup.py.
+
+These tests verify the actual handler code, not CDK resource creation.
+All boto3 calls are mocked to avoid AWS dependencies.
+"""
+
+import importlib.util
+import json
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+# 'lambda' is a Python keyword, so we use importlib to load stack_cleanup.py
+_LAMBDA_FILE = Path(__file__).resolve().parents[2] / "lambda" / "stack_cleanup.py"
+
+
+def _load_cleanup_module():
+    """Import lambda/stack_cleanup.py despite 'lambda' being a reserved word."""
+    spec = importlib.util.spec_from_file_location("stack_cleanup", _LAMBDA_FILE)
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return mod
+
+
+@pytest.fixture(autouse=True)
+def _reset_module():
+    """Ensure each test gets a fresh module load."""
+    sys.modules.pop("stack_cleanup", None)
+    yield
+    sys.modules.pop("stack_cleanup", None)
+
+
+def _event(request_type, **props):
+    return {
+        "RequestType": request_type,
+        "ResponseURL": "https://example.com/response",
+        "StackId": "arn:aws:cloudformation:us-west-2:123456789012:stack/TestStack/abc",
+        "RequestId": "req-1",
+        "LogicalResourceId": "StackCleanupResource",
+        "ResourceProperties": {"StackName": "TestStack", **props},
+    }
+
+
+# ---------------------------------------------------------------------------
+# handler
+# ---------------------------------------------------------------------------
+class TestHandler:
+    @patch("boto3.client")
+    def test_create_acknowledges_without_cleanup(self, mock_boto_client):
+        mod = _load_cleanup_module()
+        with patch.object(mod, "send_response") as send_response:
+            mod.handler(_event("Create", DbClusterIdentifier="my-cluster"), MagicMock())
+
+        mock_boto_client.assert_not_called()
+        assert "boto3" not in vars(mod)
+        assert send_response.call_args[0][2] == "SUCCESS"
+
+    @patch("boto3.client")
+    def test_delete_without_targets_returns_early(self, mock_boto_client):
+        mod = _load_cleanup_module()
+        with patch.object(mod, "send_response") as send_response:
+            mod.handler(_event("Delete"), MagicMock())
+
+        mock_boto_client.assert_not_called()
+        send_response.assert_called_once()
+        assert send_response.call_args[0][2] == "SUCCESS"
+
+    @patch("boto3.client")
+    def test_delete_disables_rds_deletion_protection(self, mock_boto_client):
+        rds = MagicMock()
+        mock_boto_client.return_value = rds
+
+        mod = _load_cleanup_module()
+        with patch.object(mod, "send_response") as send_response:
+            mod.handler(_event("Delete", DbClusterIdentifier="my-cluster"), MagicMock())
+
+        rds.modify_db_cluster.assert_called_once_with(DBClusterIdentifier="my-cluster", DeletionProtection=False)
+        assert send_response.call_args[0][2] == "SUCCESS"
+
+    @patch("boto3.client")
+    def test_delete_reports_success_when_cleanup_fails(self, mock_boto_client):
+        client = MagicMock()
+        client.modify_db_cluster.side_effect = Exception("boom")
+        client.modify_load_balancer_attributes.side_effect = Exception("boom")
+        mock_boto_client.return_value = client
+
+        mod = _load_cleanup_module()
+        with patch.object(mod, "send_response") as send_response:
+            mod.handler(_event("Delete", DbClusterIdentifier="my-cluster", AlbArn="arn:alb"), MagicMock())
+
+        # Both cleanups were attempted even though each failed, and deletion is not blocked
+        client.modify_db_cluster.assert_called_once()
+        client.modify_load_balancer_attributes.assert_called_once()
+        assert send_response.call_args[0][2] == "SUCCESS"
+
+    @patch("boto3.client")
+    def test_clients_are_reused_across_invocations(self, mock_boto_client):
+        mod = _load_cleanup_module()
+        with patch.object(mod, "send_response"):
+            mod.handler(_event("Delete", DbClusterIdentifier="my-cluster"), MagicMock())
+            mod.handler(_event("Delete", DbClusterIdentifier="my-cluster"), MagicMock())
+
+        mock_boto_client.assert_called_once_with("rds", config=mod.client_config())
+
+
+# ---------------------------------------------------------------------------
+# _cleanup_ses
+# ---------------------------------------------------------------------------
+def _ses_client(active_names):
+    ses = MagicMock()
+    ses.exceptions.RuleSetDoesNotExistException = type("RuleSetDoesNotExistException", (Exception,), {})
+    ses.exceptions.CannotDeleteException = type("CannotDeleteException", (Exception,), {})
+    ses.describe_active_receipt_rule_set.side_effect = [{"Metadata": {"Name": name}} for name in active_names]
+    return ses
+
+
+class TestCleanupSes:
+    def test_deletes_rule_set_without_per_rule_calls(self):
+        mod = _load_cleanup_module()
+        ses = _ses_client(["other-rule-set"])
+
+        mod._cleanup_ses(ses, "my-rule-set")
+
+        # An inactive rule set needs one state check and no deactivation or polling
+        ses.describe_active_receipt_rule_set.assert_called_once()
+        ses.set_active_receipt_rule_set.assert_not_called()
+        ses.delete_receipt_rule.assert_not_called()
+        ses.delete_receipt_rule_set.assert_called_once_with(RuleSetName="my-rule-set")
+
+    def test_retries_delete_after_deactivating_again(self):
+        mod = _load_cleanup_module()
+        ses = _ses_client(["other-rule-set", "other-rule-set"])
+        ses.delete_receipt_rule_set.side_effect = [ses.exceptions.CannotDeleteException("active"), {}]
+
+        with patch.object(mod.time, "sleep"):
+            mod._cleanup_ses(ses, "my-rule-set")
+
+        ses.set_active_receipt_rule_set.assert_called_once_with(RuleSetName="")
+        assert ses.delete_receipt_rule_set.call_count == 2
+
+    def test_active_rule_set_is_deactivated_then_deleted(self):
+        mod = _load_cleanup_module()
+        ses = _ses_client(["my-rule-set", "other-rule-set"])
+
+        with patch.object(mod.time, "sleep") as sleep:
+            mod._cleanup_ses(ses, "my-rule-set")
+
+        ses.set_active_receipt_rule_set.assert_called_once_with(RuleSetName="")
+        # Deactivation was visible on the first poll, so there was no wait before the delete
+        assert ses.describe_active_receipt_rule_set.call_count == 2
+        sleep.assert_not_called()
+        ses.delete_receipt_rule_set.assert_called_once_with(RuleSetName="my-rule-set")
+
+
+# ---------------------------------------------------------------------------
+# _cleanup_backup
+# ---------------------------------------------------------------------------
+def _backup_client(arns):
+    backup = MagicMock()
+    backup.get_paginator.return_value.paginate.return_value = [
+        {"RecoveryPoints": [{"RecoveryPointArn": arn} for arn in arns]}
+    ]
+    backup.list_recovery_points_by_backup_vault.return_value = {"RecoveryPoints": []}
+    return backup
+
+
+class TestCleanupBackup:
+    def test_waits_for_vault_to_empty_after_deleting(self):
+        mod = _load_cleanup_module()
+        backup = _backup_client(["arn:rp-1", "arn:rp-2"])
+
+        mod._cleanup_backup(backup, "my-vault")
+
+        assert backup.delete_recovery_point.call_count == 2
+        backup.list_recovery_points_by_backup_vault.assert_called_once_with(BackupVaultName="my-vault", MaxResults=1)
+
+    def test_skips_wait_when_a_delete_fails(self):
+        mod = _load_cleanup_module()
+        backup = _backup_client(["arn:rp-1", "arn:rp-locked"])
+        backup.delete_recovery_point.side_effect = [{}, Exception("locked")]
+
+        with patch.object(mod, "wait_until") as wait_until:
+            mod._cleanup_backup(backup, "my-vault")
+
+        wait_until.assert_not_called()
+
+
+# ---------------------------------------------------------------------------
+# _cleanup_sagemaker
+# ---------------------------------------------------------------------------
+class TestCleanupSagemaker:
+    def _run(self, mod, ec2):
+        sagemaker = MagicMock()
+        sagemaker.describe_domain.return_value = {"VpcId": "vpc-123"}
+        tagging = MagicMock()
+        tagging.get_paginator.return_value.paginate.return_value = []
+        mod._cleanup_sagemaker(sagemaker, MagicMock(), ec2, tagging, "d-abc")
+
+    def test_deletes_enis_found_by_sagemaker_tag_across_pages(self):
+        mod = _load_cleanup_module()
+        ec2 = MagicMock()
+        paginate = ec2.get_paginator.return_value.paginate
+        paginate.return_value = [
+            {"NetworkInterfaces": [{"NetworkInterfaceId": "eni-1"}]},
+            {"NetworkInterfaces": [{"NetworkInterfaceId": "eni-2"}]},
+        ]
+
+        self._run(mod, ec2)
+
+        ec2.get_paginator.assert_called_once_with("describe_network_interfaces")
+        filters = paginate.call_args[1]["Filters"]
+        assert {"Name": "tag-key", "Values": ["ManagedByAmazonSageMakerResource"]} in filters
+        paginate.assert_called_once()
+        deleted = [c.kwargs["NetworkInterfaceId"] for c in ec2.delete_network_interface.call_args_list]
+        assert deleted == ["eni-1", "eni-2"]
+
+    def test_falls_back_to_description_filter(self):
+        mod = _load_cleanup_module()
+        ec2 = MagicMock()
+        paginate = ec2.get_paginator.return_value.paginate
+        paginate.side_effect = [
+            [{"NetworkInterfaces": []}],
+            [{"NetworkInterfaces": [{"NetworkInterfaceId": "eni-2"}]}],
+        ]
+
+        self._run(mod, ec2)
+
+        filters = paginate.call_args[1]["Filters"]
+        assert {"Name": "description", "Values": ["*SageMaker*"]} in filters
+        ec2.delete_network_interface.assert_called_once_with(NetworkInterfaceId="eni-2")
+
+
+# ---------------------------------------------------------------------------
+# send_response
+# ---------------------------------------------------------------------------
+class TestSendResponse:
+    def test_puts_cloudformation_response(self):
+        mod = _load_cleanup_module()
+        context = MagicMock(log_stream_name="log-stream")
+        with patch.object(mod, "http") as http:
+            http.request.return_value = MagicMock(status=200)
+            mod.send_response(_event("Delete"), context, "SUCCESS", {"Message": "done"})
+
+        method, url = http.request.call_args[0]
+        body = json.loads(http.request.call_args[1]["body"])
+        assert (method, url) == ("PUT", "https://example.com/response")
+        assert body["Status"] == "SUCCESS"
+        assert body["PhysicalResourceId"] == "log-stream"
+        assert body["Data"] == {"Message": "done"}
+
+    def test_logs_error_when_put_is_rejected(self):
+        mod = _load_cleanup_module()
+        context = MagicMock(log_stream_name="log-stream")
+        with patch.object(mod, "http") as http, patch.object(mod.logger, "error") as log_error:
+            http.request.return_value = MagicMock(status=403, data=b"AccessDenied")
+            mod.send_response(_event("Delete"), context, "SUCCESS")
+
+        log_error.assert_called_once()
+        assert "403" in log_error.call_args[0][0]
+        assert json.loads(http.request.call_args[1]["body"])["Data"] == {}
+
+    def test_unexpected_error_is_logged_not_raised(self):
+        mod = _load_cleanup_module()
+        context = MagicMock(log_stream_name="log-stream")
+        with patch.object(mod, "http") as http, patch.object(mod.logger, "error") as log_error:
+            http.request.side_effect = ValueError("bad url")
+            mod.send_response(_event("Delete"), context, "SUCCESS")
+
+        log_error.assert_called_once()
+
+
+# ---------------------------------------------------------------------------
+# wait_until
+# ---------------------------------------------------------------------------
+class TestWaitUntil:
+    def test_returns_immediately_when_condition_holds(self):
+        mod = _load_cleanup_module()
+        with patch.object(mod.time, "sleep") as sleep:
+            assert mod.wait_until(lambda: True, "nothing") is True
+        sleep.assert_not_called()
+
+    def test_backs_off_until_condition_holds(self):
+        mod = _load_cleanup_module()
+        results = iter([False, False, True])
+        with patch.object(mod.time, "sleep") as sleep:
+            assert mod.wait_until(lambda: next(results), "something") is True
+        assert [c.args[0] for c in sleep.call_args_list] == [1, 2]
+
+    def test_gives_up_after_timeout(self):
+        mod = _load_cleanup_module()
+        with patch.object(mod.time, "sleep"):
+            assert mod.wait_until(lambda: False, "never", timeout=0) is False
@@ -1,6 +1,9 @@
 """Unit tests for utility functions."""
 
-from openemr_ecs.utils import get_resource_suffix, is_true
+import aws_cdk as cdk
+from aws_cdk import aws_iam as iam
+
+from openemr_ecs.utils import default_policy_resource, get_resource_suffix, is_true
 
 
 class TestIsTrue:
@@ -46,3 +49,18 @@ class TestGetResourceSuffix:
         """Test that default suffix is returned with empty context."""
         context = {"other_key": "value"}
         assert get_resource_suffix(context) == "default"
+
+
+class TestDefaultPolicyResource:
+    """Tests for default_policy_resource utility function."""
+
+    def test_returns_cfn_policy_of_default_policy(self):
+        """Test that the role's DefaultPolicy CfnPolicy is returned."""
+        stack = cdk.Stack(cdk.App(), "TestStack")
+        role = iam.Role(stack, "Role", assumed_by=iam.ServicePrincipal("lambda.amazonaws.com"))
+        role.add_to_policy(iam.PolicyStatement(actions=["s3:GetObject"], resources=["*"]))
+
+        resource = default_policy_resource(role)
+
+        assert isinstance(resource, iam.CfnPolicy)
+        assert resource.node.path == "TestStack/Role/DefaultPolicy/Resource"